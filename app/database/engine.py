@@ -1,10 +1,126 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from app.database.models import Base
 
-from config import DATABASE_URL
+from config import (DATABASE_URL, DB_SQLITE_BUSY_TIMEOUT, DB_SQLITE_SYNCHRONOUS,
+                    DB_SQLITE_MMAP_SIZE, DB_SQLITE_CACHE_SIZE,
+                    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+                    DB_POOL_RECYCLE, DB_POOL_PRE_PING)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_memory_sqlite(database: str | None) -> bool:
+    return not database or database == ':memory:' or 'mode=memory' in database
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """
+    Возвращает PRAGMA, выполняемые на каждом новом соединении SQLite.
+
+    - ``journal_mode=WAL`` — читатели не блокируют писателя и наоборот;
+    - ``synchronous`` — в режиме WAL ``NORMAL`` безопасен и заметно быстрее ``FULL``;
+    - ``busy_timeout`` — сколько миллисекунд ждать блокировку вместо
+      немедленной ошибки «database is locked»;
+    - ``mmap_size`` и ``cache_size`` — размер отображаемой в память части
+      файла (байты) и страничного кэша (отрицательное значение — в КиБ).
+    """
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': DB_SQLITE_SYNCHRONOUS,
+        'busy_timeout': DB_SQLITE_BUSY_TIMEOUT,
+        'mmap_size': DB_SQLITE_MMAP_SIZE,
+        'cache_size': DB_SQLITE_CACHE_SIZE,
+    }
+
+
+def create_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Создаёт асинхронный движок SQLAlchemy с настройками под тип базы данных.
+
+    Для SQLite на каждом соединении выполняются PRAGMA из ``sqlite_pragmas``
+    (для базы в памяти — без WAL, с единственным общим соединением).
+    Для серверных СУБД (PostgreSQL, MySQL) настраивается пул соединений:
+    размер, переполнение, таймаут ожидания, пересоздание и проверка
+    соединения перед выдачей (pre-ping).
+
+    Parameters
+    ----------
+    url : str, optional
+        URL базы данных. По умолчанию ``DATABASE_URL`` из конфигурации.
+
+    Returns
+    -------
+    AsyncEngine
+        Настроенный движок.
+    """
+    backend = make_url(url).get_backend_name()
+
+    if backend != 'sqlite':
+        return create_async_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+
+    in_memory = _is_memory_sqlite(make_url(url).database)
+    pragmas = sqlite_pragmas()
+    if in_memory:
+        del pragmas['journal_mode']
+
+    kwargs = {'poolclass': StaticPool} if in_memory else {}
+    sqlite_engine = create_async_engine(
+        url,
+        # Таймаут драйвера sqlite3 в секундах дублирует busy_timeout
+        connect_args={'timeout': DB_SQLITE_BUSY_TIMEOUT / 1000},
+        **kwargs
+    )
+
+    @event.listens_for(sqlite_engine.sync_engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    return sqlite_engine
+
+
+def log_engine_settings(db_engine: AsyncEngine | None = None) -> None:
+    """
+    Пишет в лог итоговые настройки движка базы данных (без пароля).
+    """
+    db_engine = db_engine or engine
+    url = db_engine.url.render_as_string(hide_password=True)
+
+    if db_engine.dialect.name == 'sqlite':
+        settings = sqlite_pragmas()
+        if _is_memory_sqlite(db_engine.url.database):
+            del settings['journal_mode']
+    else:
+        settings = {
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_timeout': DB_POOL_TIMEOUT,
+            'pool_recycle': DB_POOL_RECYCLE,
+            'pool_pre_ping': DB_POOL_PRE_PING,
+        }
+
+    logger.info(
+        f'Database engine {url}: ' + ', '.join(f'{name}={value}' for name, value in settings.items())
+    )
+
 
-engine = create_async_engine(url=DATABASE_URL)
+engine = create_engine()
 
 async_session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -21,4 +137,4 @@ async def drop_db():
 
 async def start_up_db():
     await drop_db()
-    await create_db()
\ No newline at end of file
+    await create_db()
@@ -2,6 +2,7 @@ from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import Basket, User
+from app.database.queries.orm_user import get_user_id, user_id_cache
 
 
 async def add_data_proxies_to_basket(tg_id: int, data: dict, session: AsyncSession) -> Basket:
@@ -30,13 +31,10 @@ async def add_data_proxies_to_basket(tg_id: int, data: dict, session: AsyncSessi
         Созданная позиция корзины
     """
 
-    result = await session.execute(
-        select(User).where(User.tg_id == tg_id)
-    )
-    user = result.scalar_one()
+    user_id = await get_user_id(tg_id, session)
 
     item = Basket(
-        user_id=user.id,
+        user_id=user_id,
         proxy_version=data['proxy_version'],
         proxy_type=data['proxy_type'],
         country=data['country'],
@@ -66,14 +64,21 @@ async def delete_user_basket(tg_id: int, session: AsyncSession) -> None:
     None
         Функция не возвращает значение.
     """
+    user_id = user_id_cache.get(tg_id)
+    if user_id is None:
+        user_id = select(User.id).where(User.tg_id == tg_id).scalar_subquery()
+
     await session.execute(
-        delete(Basket)
-        .where(Basket.user_id == select(User.id).where(User.tg_id == tg_id).scalar_subquery())
+        delete(Basket).where(Basket.user_id == user_id)
     )
     await session.commit()
 
 
-async def delete_basket_items(basket_ids: list[int], session: AsyncSession) -> None:
+async def delete_basket_items(
+    basket_ids: list[int],
+    session: AsyncSession,
+    commit: bool = True
+) -> None:
     """
     Удаляет конкретные элементы корзины по их ID.
 
@@ -83,6 +88,9 @@ async def delete_basket_items(basket_ids: list[int], session: AsyncSession) -> N
         Список ID элементов корзины для удаления.
     session : AsyncSession
         Асинхронная SQLAlchemy-сессия.
+    commit : bool, optional
+        Фиксировать ли транзакцию. ``False`` позволяет записать несколько
+        изменений одним коммитом. По умолчанию True.
 
     Returns
     -------
@@ -92,7 +100,8 @@ async def delete_basket_items(basket_ids: list[int], session: AsyncSession) -> N
     await session.execute(
         delete(Basket).where(Basket.id.in_(basket_ids))
     )
-    await session.commit()
+    if commit:
+        await session.commit()
 
 
 async def get_user_basket_proxies(tg_id: int, session: AsyncSession) -> list[Basket]:
@@ -111,7 +120,12 @@ async def get_user_basket_proxies(tg_id: int, session: AsyncSession) -> list[Bas
     list[Basket]
         Список объектов Basket, добавленных пользователем.
     """
-    result = await session.scalars(
-        select(Basket).join(User).where(User.tg_id == tg_id)
-    )
+    user_id = user_id_cache.get(tg_id)
+
+    if user_id is not None:
+        result = await session.scalars(select(Basket).where(Basket.user_id == user_id))
+    else:
+        result = await session.scalars(
+            select(Basket).join(User).where(User.tg_id == tg_id)
+        )
     return list(result)
\ No newline at end of file
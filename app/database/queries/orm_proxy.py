@@ -1,17 +1,69 @@
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.database.models import User, Proxy
+from app.database.queries.orm_user import get_user_id, user_id_cache
 
 
-async def add_proxies(tg_id: int, data: dict, session: AsyncSession) -> None:
+def build_proxy_rows(user_id: int, data: dict) -> list[dict]:
+    """
+    Преобразует ответ метода ``buy`` API Proxy6 в строки таблицы ``proxies``.
+
+    ORM-объекты не создаются; одинаковые метки времени (у прокси одного
+    заказа они обычно совпадают) конвертируются в ``datetime`` один раз.
+
+    Parameters
+    ----------
+    user_id : int
+        ``users.id`` владельца прокси.
+    data : dict
+        Ответ API с ключами ``country`` и ``list`` (см. ``add_proxies``).
+
+    Returns
+    -------
+    list[dict]
+        Словари значений колонок ``Proxy`` для ``insert(Proxy)``.
+    """
+    country = data['country']
+    timestamps: dict[int, datetime] = {}
+
+    def to_datetime(unixtime: int) -> datetime:
+        value = timestamps.get(unixtime)
+        if value is None:
+            value = timestamps[unixtime] = datetime.fromtimestamp(unixtime)
+        return value
+
+    return [
+        {
+            'user_id': user_id,
+
+            'ip': proxy_data['host'],
+            'port': proxy_data['port'],
+            'login': proxy_data['user'],
+            'password': proxy_data['pass'],
+
+            'proxy_type': proxy_data['type'],
+            'proxy_version': proxy_data['version'],
+            'country': country,
+
+            'date_start': to_datetime(proxy_data['unixtime']),
+            'date_end': to_datetime(proxy_data['unixtime_end']),
+
+            'ids': int(proxy_data['id']),
+        }
+        for proxy_data in data['list'].values()
+    ]
+
+
+async def add_proxies(tg_id: int, data: dict, session: AsyncSession, commit: bool = True) -> None:
     """
     Добавляет прокси пользователя в базу данных.
 
-    Функция получает пользователя по Telegram ID, создаёт объекты `Proxy`
-    на основе данных, полученных от внешнего API, и сохраняет их в базе.
+    Функция получает пользователя по Telegram ID, преобразует данные,
+    полученные от внешнего API, в строки таблицы ``proxies`` и записывает
+    их одним пакетным ``INSERT`` (executemany) без создания ORM-объектов.
 
     Parameters
     ----------
@@ -37,6 +89,9 @@ async def add_proxies(tg_id: int, data: dict, session: AsyncSession) -> None:
         }
     session : AsyncSession
         Асинхронная SQLAlchemy-сессия.
+    commit : bool, optional
+        Фиксировать ли транзакцию. ``False`` позволяет записать несколько
+        изменений одним коммитом. По умолчанию True.
 
     Returns
     -------
@@ -48,36 +103,14 @@ async def add_proxies(tg_id: int, data: dict, session: AsyncSession) -> None:
     NoResultFound
         Если пользователь с указанным Telegram ID не найден.
     """
+    user_id = await get_user_id(tg_id, session)
 
-    result = await session.execute(
-        select(User).where(User.tg_id == tg_id)
-    )
-    user = result.scalar_one()
-
-    country = data['country']
-
-    for proxy_data in data['list'].values():
-        item = Proxy(
-            user_id=user.id,
+    rows = build_proxy_rows(user_id, data)
+    if rows:
+        await session.execute(insert(Proxy), rows)
 
-            ip=proxy_data['host'],
-            port=proxy_data['port'],
-            login=proxy_data['user'],
-            password=proxy_data['pass'],
-
-            proxy_type=proxy_data['type'],
-            proxy_version=proxy_data['version'],
-            country=country,
-
-            date_start=datetime.fromtimestamp(proxy_data['unixtime']),
-            date_end=datetime.fromtimestamp(proxy_data['unixtime_end']),
-
-            ids=int(proxy_data['id']),
-        )
-
-        session.add(item)
-
-    await session.commit()
+    if commit:
+        await session.commit()
 
 
 async def get_user_proxies(tg_id: int, session: AsyncSession) -> list[Proxy]:
@@ -99,10 +132,15 @@ async def get_user_proxies(tg_id: int, session: AsyncSession) -> list[Proxy]:
     list[Proxy]
         Список объектов Proxy пользователя.
     """
-    result = await session.scalars(
-        select(Proxy)
-        .join(User)
-        .where(User.tg_id == tg_id)
-    )
+    user_id = user_id_cache.get(tg_id)
+
+    if user_id is not None:
+        result = await session.scalars(select(Proxy).where(Proxy.user_id == user_id))
+    else:
+        result = await session.scalars(
+            select(Proxy)
+            .join(User)
+            .where(User.tg_id == tg_id)
+        )
 
     return list(result)
\ No newline at end of file
@@ -0,0 +1,81 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.queries.orm_basket import delete_basket_items
+from app.database.queries.orm_proxy import add_proxies
+from app.database.queries.orm_spending import add_spending
+
+
+async def record_purchases(
+    tg_id: int,
+    purchases: list[tuple[dict, list[int]]],
+    session: AsyncSession
+) -> None:
+    """
+    Записывает результаты одной или нескольких покупок одной транзакцией.
+
+    Для каждой покупки сохраняются купленные прокси и запись о расходах,
+    затем из корзины удаляются оплаченные позиции. Всё фиксируется одним
+    коммитом (group commit): либо покупка записана целиком, либо не записано
+    ничего, и корзина не очищается.
+
+    Parameters
+    ----------
+    tg_id : int
+        Telegram ID пользователя.
+    purchases : list[tuple[dict, list[int]]]
+        Пары ``(ответ метода buy API Proxy6, ID позиций корзины)``.
+        Для покупки не из корзины список ID пустой.
+    session : AsyncSession
+        Асинхронная SQLAlchemy-сессия.
+
+    Returns
+    -------
+    None
+        Функция не возвращает значение.
+
+    Raises
+    ------
+    Exception
+        Ошибка записи; транзакция при этом откатывается.
+    """
+    if not purchases:
+        return
+
+    try:
+        for data, _ in purchases:
+            await add_proxies(tg_id=tg_id, data=data, session=session, commit=False)
+            await add_spending(tg_id=tg_id, data=data, session=session, commit=False)
+
+        basket_ids = [basket_id for _, ids in purchases for basket_id in ids]
+        if basket_ids:
+            await delete_basket_items(basket_ids, session, commit=False)
+
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def record_purchase(
+    tg_id: int,
+    data: dict,
+    session: AsyncSession,
+    basket_ids: list[int] | None = None
+) -> None:
+    """
+    Записывает результат одной покупки одной транзакцией.
+
+    См. ``record_purchases``.
+
+    Parameters
+    ----------
+    tg_id : int
+        Telegram ID пользователя.
+    data : dict
+        Ответ метода ``buy`` API Proxy6.
+    session : AsyncSession
+        Асинхронная SQLAlchemy-сессия.
+    basket_ids : list[int] | None, optional
+        ID оплаченных позиций корзины, которые нужно удалить.
+    """
+    await record_purchases(tg_id, [(data, basket_ids or [])], session)
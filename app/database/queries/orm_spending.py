@@ -1,10 +1,16 @@
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import User, Spending
+from app.database.models import Spending
+from app.database.queries.orm_user import get_user_id
 
 
-async def add_spending(*, tg_id: int, data: dict, session: AsyncSession) -> Spending:
+async def add_spending(
+    *,
+    tg_id: int,
+    data: dict,
+    session: AsyncSession,
+    commit: bool = True
+) -> Spending:
     """
     Добавляет запись о расходах пользователя (Spending) в базу данных.
 
@@ -29,6 +35,9 @@ async def add_spending(*, tg_id: int, data: dict, session: AsyncSession) -> Spen
         }
     session : AsyncSession
         Асинхронная SQLAlchemy-сессия.
+    commit : bool, optional
+        Фиксировать ли транзакцию. ``False`` позволяет записать несколько
+        изменений одним коммитом. По умолчанию True.
 
     Returns
     -------
@@ -36,13 +45,10 @@ async def add_spending(*, tg_id: int, data: dict, session: AsyncSession) -> Spen
         Добавленный объект Spending, содержащий информацию о расходах пользователя.
     """
     
-    result = await session.execute(
-        select(User).where(User.tg_id == tg_id)
-    )
-    user = result.scalar_one()
+    user_id = await get_user_id(tg_id, session)
 
     spending = Spending(
-        user_id=user.id,
+        user_id=user_id,
 
         amount=int(float(data['price']) * 100),
         currency=data.get('currency', 'RUB'),
@@ -57,5 +63,6 @@ async def add_spending(*, tg_id: int, data: dict, session: AsyncSession) -> Spen
     )
 
     session.add(spending)
-    await session.commit()
+    if commit:
+        await session.commit()
     return spending
\ No newline at end of file
@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import User
 
+from app.utils.lru_cache import LRUCache
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +15,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Кэш tg_id → users.id: первичный ключ пользователя не меняется, пока он не удалён.
+# TTL ограничивает срок, в течение которого другой воркер может видеть удалённого пользователя.
+user_id_cache: LRUCache[int, int] = LRUCache(maxsize=10_000, ttl=60 * 60)
+
+
+async def get_user_id(tg_id: int, session: AsyncSession) -> int:
+    """
+    Возвращает первичный ключ пользователя по Telegram ID.
+
+    Сначала проверяется ``user_id_cache``; к базе запрос выполняется
+    только при промахе, а результат сохраняется в кэш.
+
+    Parameters
+    ----------
+    tg_id : int
+        Telegram ID пользователя.
+    session : AsyncSession
+        Асинхронная SQLAlchemy-сессия.
+
+    Returns
+    -------
+    int
+        ``users.id`` пользователя.
+
+    Raises
+    ------
+    NoResultFound
+        Если пользователь с указанным Telegram ID не найден.
+    """
+    user_id = user_id_cache.get(tg_id)
+    if user_id is not None:
+        return user_id
+
+    result = await session.execute(select(User.id).where(User.tg_id == tg_id))
+    user_id = result.scalar_one()
+    user_id_cache.set(tg_id, user_id)
+
+    return user_id
+
 
 async def add_user(user_data, session: AsyncSession):
     """
@@ -41,13 +82,16 @@ async def add_user(user_data, session: AsyncSession):
         )
 
         if not user:
-            session.add(User(
+            user = User(
                 tg_id=user_data.id,
                 first_name=user_data.first_name,
                 last_name=user_data.last_name,
                 username=user_data.username
-            ))
+            )
+            session.add(user)
             await session.commit()
+
+        user_id_cache.set(user.tg_id, user.id)
     except Exception as e:
         logger.warning(f'add_user error: {e}')
 
@@ -74,6 +118,8 @@ async def delete_user(tg_id: int, session: AsyncSession):
         await session.delete(user)
         await session.commit()
 
+    user_id_cache.invalidate(tg_id)
+
 
 async def update_user(tg_id: int, session: AsyncSession, **update_data) -> bool:
     """
@@ -129,5 +175,8 @@ async def get_data_user(tg_id: int, session: AsyncSession) -> User:
         Объект пользователя.
     """
     user: User = await session.scalar(select(User).where(User.tg_id == tg_id))
-        
+
+    if user:
+        user_id_cache.set(user.tg_id, user.id)
+
     return user
\ No newline at end of file
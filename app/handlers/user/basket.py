@@ -1,4 +1,4 @@
-import asyncio
+from html import escape
 
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
@@ -10,19 +10,17 @@ from app.database.models import Basket
 
 from app.database.queries.orm_basket import (
                                              add_data_proxies_to_basket,
-                                             delete_user_basket,
                                              get_user_basket_proxies,
                                              delete_basket_items
                                             )
-from app.database.queries.orm_spending import add_spending
-from app.database.queries.orm_proxy import add_proxies
+from app.database.queries.orm_purchase import record_purchases
 
-from app.services.proxy6.client import Proxy6Error
-from app.services.proxy6.engine import proxy_client
+from app.services.proxy6.checkout import buy_basket_groups
 
 from app.services.yookassa.payment import get_status
 from app.utils.func_for_handlers import format_basket_proxies, group_basket_items
 from app.utils.func_for_handlers import BasketGroup
+from app.utils.constants import COUNTRY_FLAGS, PROXY_VERSION_MAP
 
 from app.keyboards.basket import basket_keyboard, pay_in_basket
 
@@ -38,7 +36,7 @@ async def show_basket(callback: CallbackQuery, session: AsyncSession):
 
     baskets: list[Basket] = await get_user_basket_proxies(callback.from_user.id, session)
 
-    text, _ = await format_basket_proxies(baskets, session)
+    text, _, _ = await format_basket_proxies(baskets, session)
 
 
     if baskets:
@@ -94,7 +92,17 @@ async def pay_basket(callback: CallbackQuery, state: FSMContext, session: AsyncS
                         session
                     )
 
-    text, total_price = await format_basket_proxies(baskets, session)
+    # Перед выставлением счёта оценки по матрице цен подтверждаются у API
+    text, total_price, payable = await format_basket_proxies(baskets, session, exact=True)
+
+    # Без актуальной цены по всем позициям счёт не выставляется
+    if not payable:
+        await callback.message.edit_text(
+                            text=text,
+                            parse_mode='HTML',
+                            reply_markup=kb.basket_price_unavailable
+                        )
+        return
 
     keyboard, payment_url, payment_id = pay_in_basket(total_price)
 
@@ -127,58 +135,39 @@ async def iampayed_in_basket(callback: CallbackQuery, state: FSMContext, session
                             session
                         )
 
-        for item in baskets:
-            try:
-                proxy_data = await proxy_client.buy(
-                    count=item.count,
-                    period=item.period,
-                    country=item.country,
-                    version=item.proxy_version,
-                    type=item.proxy_type
-                )
-
-            except asyncio.TimeoutError:
-                await callback.message.edit_text(
-                    f'❌ <b>Таймаут при покупке прокси {item.country}</b>\n\n'
-                    'Сервис Proxy6 временно не отвечает.\n'
-                    'Попробуйте позже.',
-                    reply_markup=kb.return_on_start,
-                    parse_mode='HTML'
-                )
-                return
-
-            except Proxy6Error as e:
-                await callback.message.edit_text(
-                    f'❌ <b>Ошибка при покупке прокси {item.country}:</b>\n\n'
-                    f'{e}',
-                    reply_markup=kb.return_on_start,
-                    parse_mode='HTML'
-                )
-                return
-
-
-            await add_proxies(
-                tg_id=callback.from_user.id,
-                data=proxy_data,
-                session=session
-            )
+        results = await buy_basket_groups(group_basket_items(baskets))
+        purchased = [result for result in results if result.ok]
+        failed = [result for result in results if not result.ok]
 
-            await add_spending(
-                tg_id=callback.from_user.id,
-                data=proxy_data,
-                session=session
-            )
+        # Все успешные покупки и очистка корзины — одной транзакцией
+        await record_purchases(
+            callback.from_user.id,
+            [(result.data, result.group.basket_ids) for result in purchased],
+            session
+        )
 
-            # защита от 429
-            await asyncio.sleep(0.5)
+        if failed:
+            errors = '\n'.join(
+                f'• {COUNTRY_FLAGS.get(result.group.country, "🏴")} '
+                f'{PROXY_VERSION_MAP.get(result.group.proxy_version)} '
+                f'× {result.group.count}: {escape(result.error)}'
+                for result in failed
+            )
+            await callback.message.edit_text(
+                f'⚠️ <b>Куплено позиций: {len(purchased)} из {len(results)}</b>\n\n'
+                f'Не удалось купить:\n{errors}\n\n'
+                'Эти позиции остались в корзине. Попробуйте позже '
+                'или обратитесь в поддержку.',
+                reply_markup=kb.return_on_start,
+                parse_mode='HTML'
+            )
+            return
 
         await callback.message.edit_text(
             '✅ Прокси успешно куплены',
             reply_markup=kb.after_buyed_proxy
         )
 
-        await delete_user_basket(callback.from_user.id, session)
-        
         await state.clear()
 
     else:
@@ -5,17 +5,18 @@ from aiogram.types import CallbackQuery
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.fsm.context import FSMContext
 
-from app.database.queries.orm_proxy import add_proxies
-from app.database.queries.orm_spending import add_spending
+from app.database.queries.orm_purchase import record_purchase
 
 from app.services.proxy6.engine import proxy_client
 from app.services.proxy6.cache import get_countries
+from app.services.proxy6.stock import stock_index
 
 from app.services.yookassa.payment import get_status
 
 from app.utils.constants import (COUNTRY_FLAGS, COUNTRY_NAMES, 
                                 PROXY_TYPE_MAP, PROXY_VERSION_MAP)
-from app.utils.func_for_handlers import calc_price_proxy6, get_markup_contries
+from app.utils.func_for_handlers import (calc_price_proxy6, get_markup_contries, 
+                                         format_price, PRICE_UNAVAILABLE_TEXT)
 
 import app.keyboards.base as kb
 from app.keyboards.proxy import count_and_period, pay_now
@@ -25,6 +26,11 @@ class BuyProxyFSM(StatesGroup):
     active = State()
 
 
+def _max_count(data: dict) -> int | None:
+    # Остаток из фонового индекса, без запроса к API
+    return stock_index.count(data['proxy_version'], data['country'])
+
+
 user_proxy_router = Router()
 
 # ================= START BUY FLOW =================
@@ -83,10 +89,11 @@ async def set_proxy_type(callback: CallbackQuery, state: FSMContext):
 
     data = await state.get_data()
     countries = await get_countries(version=data['proxy_version'])
+    stock = stock_index.available(data['proxy_version'], countries)
 
     await callback.message.edit_text(
         '<b>🌍 ВЫБЕРИТЕ СТРАНУ:</b>',
-        reply_markup=get_markup_contries(countries),
+        reply_markup=get_markup_contries(countries, stock),
         parse_mode='HTML'
     )
 
@@ -107,9 +114,11 @@ async def set_country(callback: CallbackQuery, state: FSMContext):
         period=3
     )
 
+    data = await state.get_data()
+
     await callback.message.edit_text(
         'Выберите количество и период:',
-        reply_markup=count_and_period(count=1, period=3)
+        reply_markup=count_and_period(count=1, period=3, max_count=_max_count(data))
     )
 
 # ================= CHANGE COUNT =================
@@ -122,7 +131,9 @@ async def change_count(callback: CallbackQuery, state: FSMContext):
     count = data.get('count', 1)
     period = data.get('period', 3)
 
-    if callback.data == 'count:inc':
+    max_count = _max_count(data)
+
+    if callback.data == 'count:inc' and (max_count is None or count < max_count):
         count += 1
     elif callback.data == 'count:dec' and count > 1:
         count -= 1
@@ -130,7 +141,7 @@ async def change_count(callback: CallbackQuery, state: FSMContext):
     await state.update_data(count=count)
 
     await callback.message.edit_reply_markup(
-        reply_markup=count_and_period(count=count, period=period)
+        reply_markup=count_and_period(count=count, period=period, max_count=max_count)
     )
 
 # ================= CHANGE PERIOD =================
@@ -151,7 +162,7 @@ async def change_period(callback: CallbackQuery, state: FSMContext):
     await state.update_data(period=period)
 
     await callback.message.edit_reply_markup(
-        reply_markup=count_and_period(count=count, period=period)
+        reply_markup=count_and_period(count=count, period=period, max_count=_max_count(data))
     )
 
 # ================= BACK TO =================
@@ -179,10 +190,11 @@ async def back_to_country(callback: CallbackQuery, state: FSMContext):
 
     data = await state.get_data()
     countries = await get_countries(version=data['proxy_version'])
+    stock = stock_index.available(data['proxy_version'], countries)
 
     await callback.message.edit_text(
         '<b>🌍 ВЫБЕРИТЕ СТРАНУ:</b>',
-        reply_markup=get_markup_contries(countries),
+        reply_markup=get_markup_contries(countries, stock),
         parse_mode='HTML'
     )
 
@@ -204,29 +216,38 @@ async def selected_buy(callback: CallbackQuery, state: FSMContext, session: Asyn
     data = await state.get_data()
 
     if data:
-            price = await calc_price_proxy6(
+            quote = await calc_price_proxy6(
                 proxy_version=data['proxy_version'],
                 count=1,
                 period=data['period'],
                 session=session
             )
 
-            keyboard, payment_url, payment_id = pay_now(price)
-
             text = (
                 f"<b>{PROXY_VERSION_MAP.get(data['proxy_version'])} | "
                 f"{PROXY_TYPE_MAP.get(data['proxy_type'])} | "
                 f"{COUNTRY_FLAGS.get(data['country'])} {COUNTRY_NAMES.get(data['country'])}</b>\n"
                 f"⏳ Срок действия: <b>{data['period']} дней</b>\n"
-                f"💰 Стоимость: <b>{price / 100:.2f} ₽</b>"
+                f"💰 Стоимость: {format_price(quote)}"
             )
 
+            # Без актуальной цены счёт не выставляется
+            if not quote.payable:
+                await callback.message.edit_text(
+                    f"{text}\n\n{PRICE_UNAVAILABLE_TEXT}",
+                    parse_mode='HTML',
+                    reply_markup=kb.price_unavailable
+                )
+                return
+
+            keyboard, payment_url, payment_id = pay_now(quote.amount)
+
             await callback.message.edit_text(
                 text,
                 parse_mode='HTML', 
                 reply_markup=keyboard
             )
-            await state.update_data(payment_url=payment_url, payment_id=payment_id)
+            await state.update_data(price=quote.amount, payment_url=payment_url, payment_id=payment_id)
 
     else:
         await callback.message.edit_text(
@@ -259,16 +280,7 @@ async def iampayed(callback: CallbackQuery, state: FSMContext, session: AsyncSes
                                             type=data['proxy_type']
                                             )
                 
-                await add_proxies(
-                        tg_id=callback.from_user.id,
-                        data=proxy_data,
-                        session=session
-                        )
-                await add_spending(
-                        tg_id=callback.from_user.id,
-                        data=proxy_data,
-                        session=session
-                        )
+                await record_purchase(callback.from_user.id, proxy_data, session)
                 
                 await callback.message.edit_text(
                     '✅ Прокси успешно куплены',
@@ -283,13 +295,8 @@ async def iampayed(callback: CallbackQuery, state: FSMContext, session: AsyncSes
                 )
             await state.clear()    
         else:
-            price = await calc_price_proxy6(
-                proxy_version=data['proxy_version'],
-                count=1,
-                period=data['period'],
-                session=session
-            )
-            keyboard, payment_url, payment_id = pay_now(price, 
+            # Счёт уже выставлен — показываем ту же сумму, без нового расчёта цены
+            keyboard, payment_url, payment_id = pay_now(data.get('price', 0), 
                                                        data['payment_url'], 
                                                        data['payment_id']
                                                       )
@@ -330,16 +337,7 @@ async def add_to_basket(callback: CallbackQuery, state: FSMContext, session: Asy
                                         type=data['proxy_type']
                                         )
             
-            await add_proxies(
-                    tg_id=callback.from_user.id,
-                    data=proxy_data,
-                    session=session
-                    )
-            await add_spending(
-                    tg_id=callback.from_user.id,
-                    data=proxy_data,
-                    session=session
-                    )
+            await record_purchase(callback.from_user.id, proxy_data, session)
             
             await callback.message.edit_text(
                 '✅ Прокси успешно куплены',
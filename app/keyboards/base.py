@@ -51,6 +51,16 @@ in_basket_if_no_proxy = InlineKeyboardMarkup(inline_keyboard=[
     [InlineKeyboardButton(text='⬅️ На главную', callback_data='return_to_start')]
 ])
 
+price_unavailable = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text='🔄 Повторить', callback_data='buy:now')],
+    [InlineKeyboardButton(text='⬅️ Назад', callback_data='return_from_pay')]
+])
+
+basket_price_unavailable = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text='🔄 Повторить', callback_data='basket:pay')],
+    [InlineKeyboardButton(text='⬅️ Назад', callback_data='selected:basket')]
+])
+
 after_buyed_proxy = InlineKeyboardMarkup(inline_keyboard=[
     [InlineKeyboardButton(text='🔐 Мои прокси', callback_data='my_proxy')],
     [InlineKeyboardButton(text='⬅️ Назад на главную', callback_data='return_to_start')]
@@ -79,8 +79,16 @@ def pay_in_basket(
         - inline-клавиатуры с кнопками оплаты корзины,
         - URL для перехода к оплате,
         - идентификатора платежа в платёжной системе.
+
+    Raises
+    ------
+    ValueError
+        Если нужно создать платёж, а сумма не положительна
+        (цену получить не удалось).
     """
     if not pay_url or not pay_id:
+        if price <= 0:
+            raise ValueError(f'Refusing to create a payment for {price} kopecks')
         pay_url, pay_id = create_payment(price / 100)
 
     inline_kb = InlineKeyboardMarkup(
@@ -3,7 +3,7 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from app.services.yookassa.payment import create_payment
 
 
-def count_and_period(count: int, period: int) -> InlineKeyboardMarkup:
+def count_and_period(count: int, period: int, max_count: int | None = None) -> InlineKeyboardMarkup:
     """
     Клавиатура выбора количества прокси и периода аренды.
 
@@ -13,17 +13,25 @@ def count_and_period(count: int, period: int) -> InlineKeyboardMarkup:
         Текущее количество выбранных прокси.
     period : int
         Текущий период аренды в днях.
+    max_count : int | None, optional
+        Остаток прокси в выбранной стране. Когда количество его достигло,
+        кнопка ➕ отключается. ``None`` — остаток неизвестен.
 
     Returns
     -------
     InlineKeyboardMarkup
         Inline-клавиатура управления покупкой прокси.
     """
+    if max_count is not None and count >= max_count:
+        count_inc = InlineKeyboardButton(text='🚫', callback_data='noop')
+    else:
+        count_inc = InlineKeyboardButton(text='➕', callback_data='count:inc')
+
     return InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(text='➖', callback_data='count:dec'),
             InlineKeyboardButton(text=f'{count} шт.', callback_data='noop'),
-            InlineKeyboardButton(text='➕', callback_data='count:inc'),
+            count_inc,
         ],
         [
             InlineKeyboardButton(text='➖', callback_data='period:dec'),
@@ -75,8 +83,16 @@ def pay_now(
         - inline-клавиатуры с кнопками оплаты,
         - URL для перехода к оплате,
         - идентификатора платежа в платёжной системе.
+
+    Raises
+    ------
+    ValueError
+        Если нужно создать платёж, а сумма не положительна
+        (цену получить не удалось).
     """
     if not pay_url or not pay_id:
+        if price <= 0:
+            raise ValueError(f'Refusing to create a payment for {price} kopecks')
         pay_url, pay_id = create_payment(price / 100)
 
     inline_kb = InlineKeyboardMarkup(
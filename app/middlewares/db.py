@@ -7,6 +7,21 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 
 class DataBaseSession(BaseMiddleware):
+    """
+    Передаёт в обработчик сессию базы данных ``session``.
+
+    Сессия создаётся, только если выбранный обработчик объявил параметр
+    ``session`` (или принимает ``**kwargs``).
+
+    ``AsyncSession`` берёт соединение из пула только при первом запросе,
+    поэтому обработчик, не дошедший до базы, соединение не занимает.
+
+    Чтобы обработчик был известен, middleware регистрируется как
+    внутренняя (``dp.message.middleware(...)``,
+    ``dp.callback_query.middleware(...)``). Как внешняя middleware
+    на ``dp.update`` она открывает сессию для каждого обновления.
+    """
+
     def __init__(self, session_pool: async_sessionmaker):
         self.session_pool = session_pool
 
@@ -17,6 +32,17 @@ class DataBaseSession(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
+        if not self.needs_session(data):
+            return await handler(event, data)
+
         async with self.session_pool() as session:
             data['session'] = session
-            return await handler(event, data)
\ No newline at end of file
+            return await handler(event, data)
+
+    @staticmethod
+    def needs_session(data: Dict[str, Any]) -> bool:
+        handler_object = data.get('handler')
+        if handler_object is None:
+            return True
+
+        return handler_object.varkw or 'session' in handler_object.params
@@ -1,16 +1,69 @@
-from time import time
-from datetime import datetime
+import asyncio
+import logging
+from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import PriceCache
 
+from app.services.proxy6.cache_backend import CacheBackend, create_cache_backend
+from app.services.proxy6.client import Proxy6Error
 from app.services.proxy6.engine import proxy_client
+from app.services.proxy6.swr_cache import SWRCache
+from app.utils.lru_cache import LRUCache
 
+from config import CACHE_BACKEND_URL
+
+
+logger = logging.getLogger(__name__)
 
 _CACHE_TTL = 600  # 10 минут
-_country_cache: dict[int, dict] = {}
+
+PRICE_TTL = timedelta(days=1)  # срок актуальности цены, как в PriceCache.is_expired
+
+PRICE_FAILURE_TTL = 30  # сколько секунд не повторять запрос цены после ошибки API
+
+PriceKey = tuple[int, int, int]  # (proxy_version, count, period)
+
+# INSERT с поддержкой ON CONFLICT DO UPDATE для каждого диалекта
+_UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+# Диалекты с INSERT ... ON DUPLICATE KEY UPDATE
+_DUPLICATE_KEY_DIALECTS = ('mysql', 'mariadb')
+
+# Общий для воркеров кэш ответов API (по умолчанию — в памяти процесса)
+cache_backend: CacheBackend = create_cache_backend(CACHE_BACKEND_URL)
+
+# L1-кэш цен в памяти процесса перед таблицей price_cache
+price_l1: LRUCache[PriceKey, float] = LRUCache(maxsize=2048, ttl=PRICE_TTL.total_seconds())
+
+# Негативный кэш: комбинации, цену которых API недавно не вернул, и текст ошибки
+price_failures: LRUCache[PriceKey, str] = LRUCache(maxsize=1024, ttl=PRICE_FAILURE_TTL)
+
+
+def price_backend_key(key: PriceKey) -> str:
+    return 'price:{}:{}:{}'.format(*key)
+
+
+async def _load_countries(version: int) -> list[str]:
+    # Из N воркеров к API обращается только один, остальные берут общий результат
+    return await cache_backend.get_or_load(
+        f'countries:{version}',
+        lambda: proxy_client.get_country(version=version),
+        ttl=_CACHE_TTL
+    )
+
+
+country_cache: SWRCache[int, list[str]] = SWRCache(
+    _load_countries,
+    ttl=_CACHE_TTL,
+    name='country_cache'
+)
 
 
 async def get_countries(version: int) -> list[str]:
@@ -19,7 +72,10 @@ async def get_countries(version: int) -> list[str]:
 
     Данные запрашиваются у сервиса Proxy6 и кэшируются в памяти
     на ограниченное время (TTL), чтобы избежать лишних сетевых запросов
-    и снизить задержки при повторных вызовах.
+    и снизить задержки при повторных вызовах. После истечения TTL
+    пользователь сразу получает последний успешно загруженный список,
+    а обновление выполняется в фоне (stale-while-revalidate); ошибка
+    обновления не затирает кэш.
 
     Parameters
     ----------
@@ -35,39 +91,31 @@ async def get_countries(version: int) -> list[str]:
         Список кодов стран (ISO 3166-1 alpha-2), например:
         ['ru', 'de', 'us', 'fr'].
 
-        В случае ошибки или отсутствия данных возвращается пустой список.
+        Пустой список возвращается, только если данных ещё нет в кэше
+        и загрузить их не удалось.
     """
-    now = time()
-
-    cache = _country_cache.get(version)
-    if cache and now - cache['time'] < _CACHE_TTL:
-        return cache['data']
-
-    data = await proxy_client.get_country(version=version)
-
-    if not data:
+    try:
+        return await country_cache.get(version)
+    except (Proxy6Error, asyncio.TimeoutError) as e:
+        logger.warning(f'Countries for version {version} are unavailable: {e!r}')
         return []
 
-    _country_cache[version] = {
-        'data': data,
-        'time': now
-    }
-
-    return data
-
 
-async def get_price_cache(
+async def save_price_cache(
     *,
     proxy_version: int,
     count: int,
     period: int,
+    price_rub: float,
     session: AsyncSession
-) -> PriceCache | None:
+) -> None:
     """
-    Получает кэшированную цену прокси из базы данных.
+    Сохраняет или обновляет кэшированную цену прокси в базе данных.
 
-    Выполняет поиск записи в таблице ``price_cache`` по комбинации
-    версии прокси, количества и периода аренды.
+    Если запись с указанной комбинацией параметров уже существует,
+    её цена и время обновления перезаписываются. В противном случае
+    создаётся новая запись в таблице ``price_cache``. Обёртка над
+    ``save_price_caches`` для одной комбинации.
 
     Parameters
     ----------
@@ -77,40 +125,30 @@ async def get_price_cache(
         Количество прокси.
     period : int
         Период аренды в днях.
+    price_rub : float
+        Цена в рублях.
     session : AsyncSession
         Асинхронная сессия SQLAlchemy.
 
     Returns
     -------
-    PriceCache | None
-        Объект ``PriceCache`` при наличии записи в кэше,
-        иначе ``None``.
+    None
+        Функция не возвращает значение.
     """
-    result = await session.scalar(
-        select(PriceCache).where(
-            PriceCache.proxy_version == proxy_version,
-            PriceCache.count == count,
-            PriceCache.period == period,
-        )
-    )
-    return result
+    await save_price_caches({(proxy_version, count, period): price_rub}, session)
 
 
-
-async def save_price_cache(
+async def get_cached_price(
     *,
     proxy_version: int,
     count: int,
     period: int,
-    price_rub: float,
     session: AsyncSession
-) -> None:
+) -> float | None:
     """
-    Сохраняет или обновляет кэшированную цену прокси в базе данных.
+    Возвращает актуальную кэшированную цену прокси в рублях.
 
-    Если запись с указанной комбинацией параметров уже существует,
-    её цена и время обновления перезаписываются. В противном случае
-    создаётся новая запись в таблице ``price_cache``.
+    Обёртка над ``get_cached_prices`` для одной комбинации.
 
     Parameters
     ----------
@@ -120,33 +158,296 @@ async def save_price_cache(
         Количество прокси.
     period : int
         Период аренды в днях.
-    price_rub : float
-        Цена в рублях.
     session : AsyncSession
         Асинхронная сессия SQLAlchemy.
 
     Returns
     -------
-    None
-        Функция не возвращает значение.
+    float | None
+        Цена в рублях или ``None``, если актуальной цены нет.
+    """
+    key = (proxy_version, count, period)
+    prices = await get_cached_prices([key], session)
+    return prices.get(key)
+
+
+async def get_cached_prices(
+    keys: list[PriceKey],
+    session: AsyncSession
+) -> dict[PriceKey, float]:
+    """
+    Возвращает актуальные кэшированные цены для нескольких комбинаций сразу.
+
+    Комбинации, найденные в L1-кэше, в базу не запрашиваются; остальные
+    загружаются из таблицы ``price_cache`` одним запросом.
+
+    Parameters
+    ----------
+    keys : list[PriceKey]
+        Комбинации ``(proxy_version, count, period)``.
+    session : AsyncSession
+        Асинхронная сессия SQLAlchemy.
+
+    Returns
+    -------
+    dict[PriceKey, float]
+        Цены в рублях для комбинаций, у которых есть актуальная цена.
     """
-    cache = await get_price_cache(
-        proxy_version=proxy_version,
-        count=count,
-        period=period,
-        session=session
+    prices: dict[PriceKey, float] = {}
+    misses: list[PriceKey] = []
+
+    for key in dict.fromkeys(keys):
+        price_rub = price_l1.get(key)
+        if price_rub is None:
+            misses.append(key)
+        else:
+            prices[key] = price_rub
+
+    if not misses:
+        return prices
+
+    rows = await session.scalars(
+        select(PriceCache).where(
+            tuple_(PriceCache.proxy_version, PriceCache.count, PriceCache.period).in_(misses)
+        )
     )
 
-    if cache:
-        cache.price_rub = price_rub
-        cache.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    for cache in rows:
+        if cache.is_expired():
+            continue
+        key = (cache.proxy_version, cache.count, cache.period)
+        price_l1.set(key, cache.price_rub, ttl=(PRICE_TTL - (now - cache.updated_at)).total_seconds())
+        prices[key] = cache.price_rub
+
+    return prices
+
+
+async def get_last_known_prices(
+    keys: list[PriceKey],
+    session: AsyncSession
+) -> dict[PriceKey, float]:
+    """
+    Возвращает последние сохранённые цены, в том числе устаревшие.
+
+    Используется как запасной вариант, когда API Proxy6 недоступен:
+    такую цену можно показать пользователю с пометкой, но не выставлять
+    по ней счёт.
+
+    Parameters
+    ----------
+    keys : list[PriceKey]
+        Комбинации ``(proxy_version, count, period)``.
+    session : AsyncSession
+        Асинхронная сессия SQLAlchemy.
+
+    Returns
+    -------
+    dict[PriceKey, float]
+        Цены в рублях для комбинаций, которые когда-либо сохранялись.
+    """
+    if not keys:
+        return {}
+
+    rows = await session.execute(
+        select(PriceCache.proxy_version, PriceCache.count, PriceCache.period, PriceCache.price_rub)
+        .where(tuple_(PriceCache.proxy_version, PriceCache.count, PriceCache.period).in_(keys))
+    )
+    return {(version, count, period): price_rub for version, count, period, price_rub in rows}
+
+
+async def save_price_caches(
+    prices: dict[PriceKey, float],
+    session: AsyncSession
+) -> None:
+    """
+    Сохраняет или обновляет цены нескольких комбинаций одним запросом.
+
+    Все строки записываются одним ``INSERT ... ON CONFLICT DO UPDATE``
+    (SQLite и PostgreSQL) или ``INSERT ... ON DUPLICATE KEY UPDATE``
+    (MySQL) по уникальному индексу ``idx_price_cache_unique``, поэтому
+    параллельные обновления одной комбинации не приводят к ошибке
+    уникальности, а запись занимает одно обращение к базе. Для остальных
+    диалектов существующие записи выбираются одним запросом
+    и обновляются, недостающие — добавляются.
+
+    Parameters
+    ----------
+    prices : dict[PriceKey, float]
+        Цены в рублях по комбинациям ``(proxy_version, count, period)``.
+    session : AsyncSession
+        Асинхронная сессия SQLAlchemy.
+    """
+    if not prices:
+        return
+
+    dialect = session.bind.dialect.name
+    now = datetime.utcnow()
+    rows = [
+        {
+            'proxy_version': proxy_version,
+            'count': count,
+            'period': period,
+            'price_rub': price_rub,
+            'updated_at': now,
+        }
+        for (proxy_version, count, period), price_rub in prices.items()
+    ]
+
+    if dialect in _UPSERT_INSERTS:
+        stmt = _UPSERT_INSERTS[dialect](PriceCache).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PriceCache.proxy_version, PriceCache.count, PriceCache.period],
+            set_={
+                'price_rub': stmt.excluded.price_rub,
+                'updated_at': stmt.excluded.updated_at,
+            }
+        )
+        await session.execute(stmt)
+    elif dialect in _DUPLICATE_KEY_DIALECTS:
+        stmt = mysql.insert(PriceCache).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            price_rub=stmt.inserted.price_rub,
+            updated_at=stmt.inserted.updated_at
+        )
+        await session.execute(stmt)
     else:
-        cache = PriceCache(
-            proxy_version=proxy_version,
-            count=count,
-            period=period,
-            price_rub=price_rub
+        await _save_price_caches_generic(prices, now, session)
+
+    await session.commit()
+
+    for key, price_rub in prices.items():
+        price_l1.set(key, price_rub)
+
+
+async def _save_price_caches_generic(
+    prices: dict[PriceKey, float],
+    now: datetime,
+    session: AsyncSession
+) -> None:
+    existing = await session.scalars(
+        select(PriceCache).where(
+            tuple_(PriceCache.proxy_version, PriceCache.count, PriceCache.period).in_(list(prices))
         )
-        session.add(cache)
+    )
+
+    missing = dict(prices)
+    for cache in existing:
+        cache.price_rub = missing.pop((cache.proxy_version, cache.count, cache.period))
+        cache.updated_at = now
+
+    session.add_all(
+        PriceCache(proxy_version=proxy_version, count=count, period=period, price_rub=price_rub, updated_at=now)
+        for (proxy_version, count, period), price_rub in missing.items()
+    )
+
+
+async def invalidate_price_cache(
+    proxy_version: int | None = None,
+    count: int | None = None,
+    period: int | None = None
+) -> None:
+    """
+    Сбрасывает кэш цен: одну комбинацию, все цены версии (если указана
+    только ``proxy_version``) или, без аргументов, весь кэш.
+
+    Цена удаляется из L1-кэша и общего кэш-бэкенда; остальные воркеры
+    сбрасывают свой L1 через ``SharedCacheSync``. Таблица ``price_cache``
+    не изменяется.
+    """
+    if proxy_version is None:
+        price_l1.invalidate()
+        await cache_backend.invalidate('price:*')
+    elif count is None:
+        _invalidate_price_version(proxy_version)
+        await cache_backend.invalidate(f'price:{proxy_version}:*')
+    else:
+        key = (proxy_version, count, period)
+        price_l1.invalidate(key)
+        await cache_backend.invalidate(price_backend_key(key))
+
+
+def _invalidate_price_version(proxy_version: int) -> None:
+    for key, _, _ in price_l1.items():
+        if key[0] == proxy_version:
+            price_l1.invalidate(key)
+
+
+async def invalidate_countries(version: int | None = None) -> None:
+    """
+    Сбрасывает кэш списков стран: одной версии или, без аргументов, всех.
+    """
+    country_cache.invalidate(version)
+    await cache_backend.invalidate('countries:*' if version is None else f'countries:{version}')
+
+
+def apply_invalidation(key: str) -> None:
+    """
+    Применяет инвалидацию из общего журнала к кэшам этого процесса.
+
+    Parameters
+    ----------
+    key : str
+        Ключ общего кэша, например ``countries:4``, ``price:4:1:30``,
+        ``price:4:*`` или ``price:*``.
+    """
+    namespace, _, rest = key.partition(':')
+
+    if namespace == 'countries':
+        country_cache.invalidate(None if rest == '*' else int(rest))
+    elif namespace == 'price':
+        if rest == '*':
+            price_l1.invalidate()
+        elif rest.endswith(':*'):
+            _invalidate_price_version(int(rest[:-2]))
+        else:
+            price_l1.invalidate(tuple(map(int, rest.split(':'))))
+
+
+class SharedCacheSync:
+    """
+    Фоновая задача, применяющая инвалидации других воркеров
+    к кэшам этого процесса.
+
+    Для необщего бэкенда (в памяти процесса) ничего не делает.
+    ``stop`` также закрывает соединение кэш-бэкенда.
+
+    Parameters
+    ----------
+    interval : float, optional
+        Период опроса журнала инвалидаций в секундах.
+    """
+
+    def __init__(self, *, interval: float = 1.0) -> None:
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if cache_backend.shared and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await cache_backend.close()
+
+    async def _run(self) -> None:
+        cursor = None
+        while True:
+            try:
+                cursor, keys = await cache_backend.invalidations(cursor)
+                for key in keys:
+                    apply_invalidation(key)
+            except Exception:
+                logger.exception('Shared cache invalidation sync failed')
+
+            await asyncio.sleep(self.interval)
+
 
-    await session.commit()
\ No newline at end of file
+shared_cache_sync = SharedCacheSync()
\ No newline at end of file
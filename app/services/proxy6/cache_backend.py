@@ -0,0 +1,441 @@
+"""
+Бэкенды кэша, общего для нескольких процессов бота.
+
+- ``InMemoryBackend`` — кэш в памяти процесса (по умолчанию, один воркер);
+- ``SQLiteBackend`` — общий файл SQLite для воркеров на одной машине;
+- ``RedisBackend`` — Redis или совместимый сервер (для тестов подходит
+  ``fakeredis``: ``RedisBackend(fakeredis.aioredis.FakeRedis())``).
+
+Бэкенд выбирается по URL через ``create_cache_backend``:
+``memory://``, ``sqlite:///path/to/cache.db``, ``redis://host:6379/0``.
+"""
+
+import asyncio
+import json
+import logging
+from time import monotonic, time
+from typing import Any, Awaitable, Callable
+
+import aiosqlite
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis — необязательная зависимость
+    aioredis = None
+
+from app.utils.lru_cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'lock:'
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class CacheBackend:
+    """
+    Интерфейс кэш-бэкенда.
+
+    Значения — любые JSON-сериализуемые объекты, у каждого свой TTL.
+    Ключ, оканчивающийся на ``*``, в ``invalidate`` означает префикс.
+    Об инвалидации узнают все воркеры: она попадает в общий журнал,
+    который читается через ``invalidations``.
+    """
+
+    #: ``True``, если кэш виден другим процессам
+    shared: bool = False
+
+    async def get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """
+        Записывает значение, только если ключа нет. Возвращает ``True`` при записи.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Удаляет ключ (или все ключи с префиксом ``key[:-1]``, если он
+        оканчивается на ``*``) и сообщает об этом остальным воркерам.
+        """
+        raise NotImplementedError
+
+    async def invalidations(self, cursor: str | None) -> tuple[str, list[str]]:
+        """
+        Возвращает инвалидации, записанные после ``cursor``.
+
+        Parameters
+        ----------
+        cursor : str | None
+            Позиция в журнале инвалидаций. ``None`` — текущий конец журнала
+            (старые инвалидации не возвращаются).
+
+        Returns
+        -------
+        tuple[str, list[str]]
+            Новая позиция и список инвалидированных ключей.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        ttl: float,
+        is_valid: Callable[[Any], bool] = bool,
+        lock_timeout: float = 10.0,
+        poll_interval: float = 0.05
+    ) -> Any:
+        """
+        Возвращает значение из кэша или загружает его.
+
+        Загрузку выполняет только один воркер: он берёт блокировку
+        ``lock:<key>`` через ``add``, остальные ждут появления значения.
+        Если владелец блокировки не уложился в ``lock_timeout`` (например,
+        процесс упал), значение загружает сам ожидающий. Ошибки самого
+        бэкенда (недоступен Redis, заблокирован файл SQLite) не пробрасываются:
+        значение загружается через ``loader`` без кэша.
+
+        Parameters
+        ----------
+        key : str
+            Ключ кэша.
+        loader : Callable[[], Awaitable[Any]]
+            Корутина загрузки значения.
+        ttl : float
+            Время жизни значения в секундах.
+        is_valid : Callable[[Any], bool], optional
+            Проверка результата; невалидные значения не кэшируются.
+        lock_timeout : float, optional
+            Максимальное время ожидания чужой загрузки в секундах.
+        poll_interval : float, optional
+            Период проверки значения во время ожидания.
+
+        Returns
+        -------
+        Any
+            Значение из кэша или результат ``loader``.
+
+        Raises
+        ------
+        Exception
+            Ошибка ``loader``.
+        """
+        lock_key = LOCK_PREFIX + key
+
+        try:
+            value = await self.get(key)
+            if value is not None:
+                return value
+
+            deadline = monotonic() + lock_timeout
+
+            while not await self.add(lock_key, 1, lock_timeout):
+                if monotonic() >= deadline:
+                    logger.warning(f'Cache lock {lock_key!r} timed out, loading without it')
+                    break
+                await asyncio.sleep(poll_interval)
+                value = await self.get(key)
+                if value is not None:
+                    return value
+        except Exception as e:
+            logger.warning(f'Cache backend read of {key!r} failed, loading without cache: {e!r}')
+            return await loader()
+
+        try:
+            value = await loader()
+            if is_valid(value):
+                try:
+                    await self.set(key, value, ttl)
+                except Exception as e:
+                    logger.warning(f'Cache backend write of {key!r} failed: {e!r}')
+            return value
+        finally:
+            try:
+                await self.delete(lock_key)
+            except Exception as e:
+                logger.warning(f'Cache backend could not release {lock_key!r}: {e!r}')
+
+
+class InMemoryBackend(CacheBackend):
+    """
+    Кэш-бэкенд в памяти процесса.
+
+    Записи хранятся в ``LRUCache``: при превышении ``maxsize`` вытесняются
+    давно неиспользуемые, поэтому память не растёт неограниченно.
+    Инвалидации видны только этому процессу, поэтому журнал всегда пуст.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Максимальное количество записей.
+    """
+
+    def __init__(self, *, maxsize: int = 4096) -> None:
+        self._data: LRUCache[str, Any] = LRUCache(maxsize=maxsize, ttl=float('inf'))
+
+    async def get(self, key: str) -> Any | None:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data.set(key, value, ttl=ttl)
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.invalidate(key)
+
+    async def invalidate(self, key: str) -> None:
+        if key.endswith('*'):
+            prefix = key[:-1]
+            for name, _, _ in self._data.items():
+                if name.startswith(prefix):
+                    self._data.invalidate(name)
+        else:
+            await self.delete(key)
+
+    async def invalidations(self, cursor: str | None) -> tuple[str, list[str]]:
+        return cursor or '0', []
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Общий кэш-бэкенд в файле SQLite.
+
+    Подходит для нескольких воркеров на одной машине. Время истечения
+    хранится как unix time, поэтому одинаково для всех процессов.
+
+    Parameters
+    ----------
+    path : str
+        Путь к файлу базы данных кэша.
+    invalidation_retention : float, optional
+        Сколько секунд хранить записи журнала инвалидаций.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, *, invalidation_retention: float = 3600.0) -> None:
+        self.path = path
+        self.invalidation_retention = invalidation_retention
+        self._db: aiosqlite.Connection | None = None
+        self._init_lock = asyncio.Lock()
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._db is not None:
+            return self._db
+
+        async with self._init_lock:
+            if self._db is None:
+                db = await aiosqlite.connect(self.path)
+                await db.execute('PRAGMA journal_mode=WAL')
+                await db.execute('PRAGMA busy_timeout=5000')
+                await db.execute(
+                    'CREATE TABLE IF NOT EXISTS cache ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+                )
+                await db.execute(
+                    'CREATE TABLE IF NOT EXISTS cache_invalidations ('
+                    'id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, created_at REAL NOT NULL)'
+                )
+                await db.commit()
+                self._db = db
+
+        return self._db
+
+    async def get(self, key: str) -> Any | None:
+        db = await self._conn()
+        async with db.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)) as cursor:
+            row = await cursor.fetchone()
+        if row is None or row[1] <= time():
+            return None
+        return json.loads(row[0])
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        db = await self._conn()
+        await db.execute(
+            'INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at',
+            (key, _dumps(value), time() + ttl)
+        )
+        await db.commit()
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        db = await self._conn()
+        now = time()
+        # Оба запроса выполняются в одной транзакции записи
+        await db.execute('DELETE FROM cache WHERE key = ? AND expires_at <= ?', (key, now))
+        cursor = await db.execute(
+            'INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, _dumps(value), now + ttl)
+        )
+        await db.commit()
+        return cursor.rowcount == 1
+
+    async def delete(self, key: str) -> None:
+        db = await self._conn()
+        await db.execute('DELETE FROM cache WHERE key = ?', (key,))
+        await db.commit()
+
+    async def invalidate(self, key: str) -> None:
+        db = await self._conn()
+        now = time()
+        if key.endswith('*'):
+            prefix = key[:-1].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            await db.execute("DELETE FROM cache WHERE key LIKE ? ESCAPE '\\'", (prefix + '%',))
+        else:
+            await db.execute('DELETE FROM cache WHERE key = ?', (key,))
+        await db.execute('INSERT INTO cache_invalidations (key, created_at) VALUES (?, ?)', (key, now))
+        await db.execute(
+            'DELETE FROM cache_invalidations WHERE created_at < ?',
+            (now - self.invalidation_retention,)
+        )
+        await db.commit()
+
+    async def invalidations(self, cursor: str | None) -> tuple[str, list[str]]:
+        db = await self._conn()
+
+        if cursor is None:
+            async with db.execute('SELECT COALESCE(MAX(id), 0) FROM cache_invalidations') as rows:
+                (last_id,) = await rows.fetchone()
+            return str(last_id), []
+
+        async with db.execute(
+            'SELECT id, key FROM cache_invalidations WHERE id > ? ORDER BY id LIMIT 1000',
+            (int(cursor),)
+        ) as rows:
+            found = await rows.fetchall()
+
+        if not found:
+            return cursor, []
+        return str(found[-1][0]), [key for _, key in found]
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+class RedisBackend(CacheBackend):
+    """
+    Общий кэш-бэкенд в Redis или совместимом сервере.
+
+    Блокировки загрузки — ``SET NX PX``, журнал инвалидаций — поток
+    (stream) ``<prefix>invalidations`` ограниченной длины.
+
+    Parameters
+    ----------
+    client : redis.asyncio.Redis
+        Клиент Redis (или ``fakeredis.aioredis.FakeRedis``).
+    prefix : str, optional
+        Префикс всех ключей бота.
+    stream_maxlen : int, optional
+        Приблизительная максимальная длина журнала инвалидаций.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any, *, prefix: str = 'proxy6:', stream_maxlen: int = 10_000) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.stream = f'{prefix}invalidations'
+        self.stream_maxlen = stream_maxlen
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisBackend':
+        if aioredis is None:
+            raise RuntimeError('Redis cache backend requires the "redis" package: pip install redis')
+        return cls(aioredis.from_url(url), **kwargs)
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.client.set(self.prefix + key, _dumps(value), px=max(1, int(ttl * 1000)))
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(await self.client.set(
+            self.prefix + key, _dumps(value), px=max(1, int(ttl * 1000)), nx=True
+        ))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def invalidate(self, key: str) -> None:
+        if key.endswith('*'):
+            names = [name async for name in self.client.scan_iter(match=self.prefix + key)]
+            if names:
+                await self.client.delete(*names)
+        else:
+            await self.client.delete(self.prefix + key)
+
+        await self.client.xadd(self.stream, {'key': key}, maxlen=self.stream_maxlen, approximate=True)
+
+    async def invalidations(self, cursor: str | None) -> tuple[str, list[str]]:
+        if cursor is None:
+            last = await self.client.xrevrange(self.stream, count=1)
+            return (_decode(last[0][0]) if last else '0-0'), []
+
+        response = await self.client.xread({self.stream: cursor}, count=1000)
+        if not response:
+            return cursor, []
+
+        _, entries = response[0]
+        keys = [_decode(fields.get(b'key', fields.get('key'))) for _, fields in entries]
+        return _decode(entries[-1][0]), keys
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def create_cache_backend(url: str | None) -> CacheBackend:
+    """
+    Создаёт кэш-бэкенд по URL.
+
+    Parameters
+    ----------
+    url : str | None
+        ``None`` или ``memory://`` — кэш в памяти процесса,
+        ``sqlite:///path`` — общий файл SQLite,
+        ``redis://...`` / ``rediss://...`` / ``unix://...`` — Redis.
+
+    Returns
+    -------
+    CacheBackend
+        Кэш-бэкенд.
+
+    Raises
+    ------
+    ValueError
+        Если схема URL не поддерживается.
+    """
+    if not url or url == 'memory://':
+        return InMemoryBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend.from_url(url)
+    raise ValueError(f'Unsupported cache backend URL: {url!r}')
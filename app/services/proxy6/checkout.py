@@ -0,0 +1,71 @@
+import asyncio
+from dataclasses import dataclass
+
+from app.services.proxy6.client import Proxy6Error, Proxy6TransientError
+from app.services.proxy6.engine import proxy_client
+
+from app.utils.func_for_handlers import BasketGroup
+
+from config import CHECKOUT_CONCURRENCY
+
+
+@dataclass
+class PurchaseResult:
+    group: BasketGroup
+    data: dict | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+async def buy_basket_groups(
+    groups: list[BasketGroup],
+    *,
+    concurrency: int = CHECKOUT_CONCURRENCY
+) -> list[PurchaseResult]:
+    """
+    Покупает сгруппированные позиции корзины параллельно.
+
+    Одинаковые позиции уже объединены ``group_basket_items``, поэтому
+    каждая группа покупается одним запросом ``buy``. Одновременно
+    выполняется не более ``concurrency`` покупок; частоту запросов
+    дополнительно ограничивает rate limiter клиента Proxy6.
+
+    Ошибка одной позиции не прерывает покупку остальных.
+
+    Parameters
+    ----------
+    groups : list[BasketGroup]
+        Сгруппированные позиции корзины.
+    concurrency : int, optional
+        Максимальное число одновременных покупок.
+        По умолчанию ``CHECKOUT_CONCURRENCY`` из конфигурации.
+
+    Returns
+    -------
+    list[PurchaseResult]
+        Результаты покупки в порядке ``groups``: данные ответа ``buy``
+        для успешных позиций и текст ошибки для неуспешных.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def buy_one(group: BasketGroup) -> PurchaseResult:
+        async with semaphore:
+            try:
+                data = await proxy_client.buy(
+                    count=group.count,
+                    period=group.period,
+                    country=group.country,
+                    version=group.proxy_version,
+                    type=group.proxy_type
+                )
+            except Proxy6TransientError:
+                return PurchaseResult(group, error='Сервис Proxy6 временно не отвечает')
+            except Proxy6Error as e:
+                return PurchaseResult(group, error=str(e))
+
+        return PurchaseResult(group, data=data)
+
+    return list(await asyncio.gather(*(buy_one(group) for group in groups)))
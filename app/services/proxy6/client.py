@@ -8,9 +8,23 @@ Copyright (c) 2026 Alexsey Novikov
 """
 
 
+import asyncio
+import logging
+from time import monotonic
+from typing import AsyncIterator, Iterable, Iterator
+
 import requests
 import aiohttp 
 
+from app.services.proxy6.json_decoder import JSONLoads, default_loads
+from app.services.proxy6.limiter import AdaptiveRateLimiter, proxy6_limiter
+from app.services.proxy6.metrics import InMemoryMetrics, MetricsSink
+from app.services.proxy6.retry import CircuitBreaker, RetryPolicy
+from app.services.proxy6.singleflight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
 
 class Proxy6Error(Exception):
     """
@@ -24,6 +38,98 @@ class Proxy6Error(Exception):
     ...
 
 
+class Proxy6TransientError(Proxy6Error):
+    """
+    Временная ошибка API Proxy6, после которой запрос имеет смысл повторить:
+    сетевая ошибка, ответ 5xx или 429 (``throttled=True``).
+    """
+
+    def __init__(self, message: str, *, throttled: bool = False) -> None:
+        super().__init__(message)
+        self.throttled = throttled
+
+
+class Proxy6CircuitOpenError(Proxy6Error):
+    """
+    Запрос отклонён без обращения к сети: автоматический выключатель
+    разомкнут после серии ошибок API Proxy6.
+    """
+    ...
+
+
+class Proxy6BulkError(Proxy6Error):
+    """
+    Ошибка массовой операции: часть пакетов ID обработать не удалось.
+
+    Attributes
+    ----------
+    failed_ids : tuple[int, ...]
+        ID прокси из пакетов, завершившихся ошибкой.
+    errors : list[BaseException]
+        Исключения по каждому неуспешному пакету (в том числе отмена).
+    """
+
+    def __init__(self, failed_ids: tuple[int, ...], errors: list[BaseException]) -> None:
+        super().__init__(
+            f'{len(errors)} chunk(s) failed for {len(failed_ids)} proxies: {errors[0]!r}'
+        )
+        self.failed_ids = failed_ids
+        self.errors = errors
+
+
+IDS_PARAM_MAX_LENGTH = 1500
+
+
+def chunk_ids(ids: Iterable[int], max_length: int = IDS_PARAM_MAX_LENGTH) -> list[tuple[int, ...]]:
+    """
+    Делит ID прокси на пакеты, каждый из которых в виде строки '1,2,3'
+    не длиннее ``max_length`` символов, чтобы URL запроса не отклонялся
+    сервером или промежуточными прокси.
+
+    Повторяющиеся ID отбрасываются, порядок сохраняется.
+
+    Parameters
+    ----------
+    ids : Iterable[int]
+        ID прокси.
+    max_length : int, optional
+        Максимальная длина параметра ``ids`` в символах.
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        Список пакетов ID.
+    """
+    chunks = []
+    chunk = []
+    length = 0
+
+    for proxy_id in dict.fromkeys(ids):
+        item_length = len(str(proxy_id)) + (1 if chunk else 0)
+        if chunk and length + item_length > max_length:
+            chunks.append(tuple(chunk))
+            chunk, length = [], 0
+            item_length -= 1
+        chunk.append(proxy_id)
+        length += item_length
+
+    if chunk:
+        chunks.append(tuple(chunk))
+
+    return chunks
+
+
+def parse_proxy_status(value) -> bool:
+    """
+    Приводит поле ``proxy_status`` ответа ``check`` к ``bool``.
+
+    API возвращает JSON-значение ``true``/``false``, но встречается
+    и строковая форма ``"true"``; синхронный и асинхронный клиенты
+    разбирают её одинаково.
+    """
+    return value is True or value == 'true'
+
+
 class Proxy6:
     """
     Синхронный клиент для взаимодействия с API Proxy6.
@@ -34,11 +140,23 @@ class Proxy6:
     ----------
     api : str
         API-ключ для аутентификации в сервисе Proxy6.
+    loads : JSONLoads | None, optional
+        Функция декодирования JSON из байтов ответа. По умолчанию
+        ``orjson.loads``, если orjson установлен, иначе ``json.loads``.
+    base_url : str | None, optional
+        Базовый URL API, например адрес локального ``MockProxy6Server``.
+        По умолчанию ``BASE_URL``.
     """
 
     BASE_URL = 'https://px6.link/api'
 
-    def __init__(self, api: str) -> None:
+    def __init__(
+        self,
+        api: str,
+        *,
+        loads: JSONLoads | None = None,
+        base_url: str | None = None
+    ) -> None:
         """
         Инициализация клиента.
 
@@ -46,9 +164,15 @@ class Proxy6:
         ----------
         api : str
             API-ключ для Proxy6.
+        loads : JSONLoads | None, optional
+            Функция декодирования JSON.
+        base_url : str | None, optional
+            Базовый URL API.
         """
         self.api = api
-        self.url = f'{self.BASE_URL}/{self.api}/'
+        self.loads = loads or default_loads
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.url = f'{self.base_url}/{self.api}/'
         self.session: requests.Session = requests.Session()
 
     def _prepare_params(self, params: dict) -> dict:
@@ -107,7 +231,7 @@ class Proxy6:
         try:
             response = self.session.get(url, params=prepared_params, timeout=15)
             response.raise_for_status()
-            data: dict[str, object] = response.json()
+            data: dict[str, object] = self.loads(response.content)
         except requests.RequestException as e:
             raise Proxy6Error(f'HTTP error: {e}') from e
         except ValueError:
@@ -211,6 +335,45 @@ class Proxy6:
         )
         return data['list']
 
+    def iter_proxies(
+        self,
+        *,
+        state: str = 'all',
+        descr: str | None = None,
+        limit: int = 1000,
+    ) -> Iterator[dict]:
+        """
+        Постранично обходит все прокси аккаунта и отдаёт их по одному.
+
+        В памяти одновременно находится только одна страница, поэтому
+        потребление памяти не зависит от размера аккаунта.
+
+        Parameters
+        ----------
+        state : str, optional
+            Статус прокси: 'active', 'expired', 'expiring' или 'all'. По умолчанию 'all'.
+        descr : str | None, optional
+            Фильтр по комментарию.
+        limit : int, optional
+            Размер страницы (не больше 1000). По умолчанию 1000.
+
+        Yields
+        ------
+        dict[str, object]
+            Данные одного прокси.
+        """
+        page = 1
+        while True:
+            proxies = self.get_proxy(state=state, descr=descr, page=page, limit=limit)
+            # На пустой странице API возвращает [] вместо {}
+            items = proxies.values() if isinstance(proxies, dict) else proxies
+
+            yield from items
+
+            if len(items) < limit:
+                return
+            page += 1
+
     def set_type(self, *, ids: tuple[int, ...], type: str) -> bool:
         """
         Изменяет тип протокола прокси.
@@ -368,7 +531,123 @@ class Proxy6:
             True если прокси валиден.
         """
         data = self._make_request('check', ids=ids, proxy=proxy)
-        return True if data['proxy_status'] == 'true' else False
+        return parse_proxy_status(data['proxy_status'])
+
+    def prolong_bulk(self, *, period: int, ids: Iterable[int]) -> bool:
+        """
+        Продлевает любое количество прокси, разбивая ID на пакеты.
+
+        Parameters
+        ----------
+        period : int
+            Период продления в днях.
+        ids : Iterable[int]
+            ID прокси.
+
+        Returns
+        -------
+        bool
+            True при успешном продлении всех пакетов.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        self._run_chunks(ids, lambda chunk: self.prolong(period=period, ids=chunk))
+        return True
+
+    def set_type_bulk(self, *, ids: Iterable[int], type: str) -> bool:
+        """
+        Изменяет тип протокола любого количества прокси, разбивая ID на пакеты.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            ID прокси.
+        type : str
+            Устанавливаемый тип: http - HTTPS, либо socks - SOCKS5.
+
+        Returns
+        -------
+        bool
+            True при успешной смене типа во всех пакетах.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        self._run_chunks(ids, lambda chunk: self.set_type(ids=chunk, type=type))
+        return True
+
+    def set_descr_bulk(self, *, new: str, ids: Iterable[int]) -> tuple[bool, int]:
+        """
+        Обновляет комментарий любого количества прокси, разбивая ID на пакеты.
+
+        Parameters
+        ----------
+        new : str
+            Новый комментарий.
+        ids : Iterable[int]
+            ID прокси.
+
+        Returns
+        -------
+        tuple[bool, int]
+            Кортеж: (успех операции, суммарное количество обновленных прокси)
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        results = self._run_chunks(ids, lambda chunk: self.set_descr(new=new, ids=chunk))
+        return True, sum(int(count) for _, count in results)
+
+    def delete_bulk(self, *, ids: Iterable[int]) -> bool:
+        """
+        Удаляет любое количество прокси, разбивая ID на пакеты.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            ID прокси.
+
+        Returns
+        -------
+        bool
+            True при успешном удалении всех пакетов.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        self._run_chunks(ids, lambda chunk: self.delete(ids=chunk))
+        return True
+
+    def _run_chunks(self, ids: Iterable[int], call) -> list:
+        """
+        Последовательно выполняет ``call`` для каждого пакета ID.
+
+        Ошибка одного пакета не прерывает обработку остальных; после
+        обработки всех пакетов выбрасывается ``Proxy6BulkError``.
+        """
+        results = []
+        failed_ids: list[int] = []
+        errors: list[Exception] = []
+
+        for chunk in chunk_ids(ids):
+            try:
+                results.append(call(chunk))
+            except Proxy6Error as e:
+                failed_ids.extend(chunk)
+                errors.append(e)
+
+        if errors:
+            raise Proxy6BulkError(tuple(failed_ids), errors)
+        return results
 
     def close(self) -> None:
         """
@@ -385,9 +664,9 @@ class Proxy6:
         str
             Информация об аккаунте в формате JSON.
         """
-        response = self.session.get(f'{self.BASE_URL}/{self.api}')
+        response = self.session.get(f'{self.base_url}/{self.api}')
         response.raise_for_status()
-        return str(response.json())
+        return str(self.loads(response.content))
 
 
 class AsyncProxy6:
@@ -398,12 +677,77 @@ class AsyncProxy6:
     ----------
     api : str
         API-ключ для аутентификации в сервисе Proxy6.
+    rate_limiter : AdaptiveRateLimiter | None, optional
+        Ограничитель частоты запросов. По умолчанию используется общий
+        для всего процесса ``proxy6_limiter``, так как лимит API
+        действует на весь аккаунт, а не на отдельный клиент.
+    retry_policy : RetryPolicy | None, optional
+        Политика повторов. По умолчанию повторяются только читающие методы;
+        ``buy`` и ``prolong`` выполняются один раз.
+    circuit_breaker : CircuitBreaker | None, optional
+        Автоматический выключатель, который при недоступности API
+        завершает запросы ошибкой сразу, не дожидаясь таймаута.
+    loads : JSONLoads | None, optional
+        Функция декодирования JSON из байтов ответа. По умолчанию
+        ``orjson.loads``, если orjson установлен, иначе ``json.loads``.
+    base_url : str | None, optional
+        Базовый URL API, например адрес локального ``MockProxy6Server``.
+        По умолчанию ``BASE_URL``.
+    metrics : MetricsSink | None, optional
+        Приёмник метрик: задержка и число выполняющихся запросов по методам,
+        ошибки по видам, объём полученных данных. По умолчанию ``InMemoryMetrics``.
+    limit : int, optional
+        Максимальное число одновременных соединений в пуле.
+    limit_per_host : int, optional
+        Максимальное число одновременных соединений с px6.link.
+    keepalive_timeout : float, optional
+        Сколько секунд простаивающее соединение остаётся открытым в пуле.
+    ttl_dns_cache : int, optional
+        Время жизни DNS-кэша в секундах.
+
+    Notes
+    -----
+    Одновременные вызовы читающих методов (``COALESCED_METHODS``) с одинаковыми
+    параметрами объединяются в один HTTP-запрос. Счётчики объединённых
+    вызовов доступны в ``single_flight.stats``.
     """
+
+    BASE_URL = 'https://px6.link/api'
+    COALESCED_METHODS = frozenset({'getprice', 'getcount', 'getcountry', 'getproxy', 'check'})
     
-    def __init__(self, api: str):
+    def __init__(
+        self,
+        api: str,
+        *,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        loads: JSONLoads | None = None,
+        base_url: str | None = None,
+        metrics: MetricsSink | None = None,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 60,
+        ttl_dns_cache: int = 600
+    ):
         self.api = api
-        self.url = f'https://px6.link/api/{self.api}/'
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.url = f'{self.base_url}/{self.api}/'
         self.session: aiohttp.ClientSession | None = None
+        self.rate_limiter = rate_limiter or proxy6_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.loads = loads or default_loads
+        self.metrics = metrics or InMemoryMetrics()
+        self.single_flight = SingleFlight()
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+
+        self._last_request_at = 0.0
+        self._keepalive_task: asyncio.Task | None = None
 
     async def __aenter__(self):
         """
@@ -411,7 +755,8 @@ class AsyncProxy6:
 
         Создает aiohttp.ClientSession с настроенным таймаутом,
         чтобы предотвратить зависание запросов при проблемах с сетью
-        или медленном ответе API.
+        или медленном ответе API, и пулом соединений с keep-alive
+        и DNS-кэшем.
 
         Returns
         -------
@@ -423,7 +768,13 @@ class AsyncProxy6:
                                         connect=10,
                                         sock_read=30
                                         )
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -433,9 +784,7 @@ class AsyncProxy6:
         Гарантирует освобождение сетевых ресурсов независимо от того,
         завершился ли блок `async with` успешно или с исключением.
         """
-        if self.session:
-            await self.session.close()
-            self.session = None
+        await self.close()
 
 
     async def __get_session(self) -> aiohttp.ClientSession:
@@ -457,7 +806,10 @@ class AsyncProxy6:
         Выполняет асинхронный HTTP-запрос к API Proxy6.
 
         Формирует GET-запрос к указанному методу API, подготавливает параметры
-        и обрабатывает сетевые ошибки.
+        и обрабатывает сетевые ошибки. Перед отправкой запрос ожидает
+        свободный слот в ограничителе частоты; ответ 429 снижает скорость
+        ограничителя. Одинаковые одновременные вызовы читающих методов
+        разделяют один запрос.
 
         Parameters
         ----------
@@ -488,12 +840,184 @@ class AsyncProxy6:
                     value = ','.join(map(str, value))
                 prepared_params[key] = value
 
+        if method_name in self.COALESCED_METHODS:
+            flight_key = (method_name, tuple(sorted(prepared_params.items())))
+            return await self.single_flight.do(
+                flight_key,
+                lambda: self.__send_request(session, url, method_name, prepared_params)
+            )
+
+        return await self.__send_request(session, url, method_name, prepared_params)
+
+    async def __send_request(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        method_name: str,
+        params: dict
+    ) -> dict:
+        """
+        Отправляет подготовленный GET-запрос с учётом автоматического
+        выключателя и политики повторов.
+
+        Временные ошибки повторяются с экспоненциальной задержкой,
+        если метод разрешён политикой ``retry_policy``.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Активная HTTP-сессия.
+        url : str
+            Полный URL метода API.
+        method_name : str
+            Название метода API Proxy6.
+        params : dict
+            Подготовленные параметры запроса.
+
+        Returns
+        -------
+        dict
+            Ответ API в формате JSON.
+
+        Raises
+        ------
+        Proxy6CircuitOpenError
+            Если выключатель разомкнут.
+        Proxy6TransientError
+            Если последняя попытка завершилась временной ошибкой (в том числе таймаутом).
+        Proxy6Error
+            При ошибке, которую нельзя повторить.
+        """
+        if not self.circuit_breaker.allow_request():
+            self.metrics.inc_error(method_name, 'circuit_open')
+            raise Proxy6CircuitOpenError(
+                f'Proxy6 API is unavailable, {method_name} rejected for '
+                f'{self.circuit_breaker.retry_in():.0f} s'
+            )
+
+        policy = self.retry_policy
+        retryable = policy.is_retryable(method_name)
+        attempts = policy.max_attempts if retryable else 1
+
+        request_kwargs = {}
+        if retryable and policy.attempt_timeout:
+            request_kwargs['timeout'] = aiohttp.ClientTimeout(total=policy.attempt_timeout)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                data = await self.__send_once(session, url, method_name, params, **request_kwargs)
+            except Proxy6TransientError as e:
+                if not e.throttled:
+                    self.circuit_breaker.record_failure()
+
+                if attempt == attempts or not self.circuit_breaker.allow_request():
+                    raise
+
+                delay = policy.backoff(attempt)
+                logger.info(
+                    f'{method_name}: attempt {attempt}/{attempts} failed ({e!r}), '
+                    f'retrying in {delay:.2f} s'
+                )
+                await asyncio.sleep(delay)
+            except Proxy6Error:
+                # API ответил (например, 4xx) — сервис доступен, это не сбой
+                self.circuit_breaker.record_success()
+                raise
+            else:
+                self.circuit_breaker.record_success()
+                return data
+
+    async def __send_once(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        method_name: str,
+        params: dict,
+        **request_kwargs
+    ) -> dict:
+        """
+        Выполняет одну попытку GET-запроса с учётом ограничителя частоты.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Активная HTTP-сессия.
+        url : str
+            Полный URL метода API.
+        method_name : str
+            Название метода API Proxy6 (для сообщений об ошибках).
+        params : dict
+            Подготовленные параметры запроса.
+        **request_kwargs
+            Дополнительные аргументы ``session.get`` (например, ``timeout``).
+
+        Returns
+        -------
+        dict
+            Ответ API в формате JSON.
+
+        Raises
+        ------
+        Proxy6TransientError
+            При сетевых ошибках, таймаутах, ответах 5xx или 429.
+        Proxy6Error
+            При остальных HTTP-ошибках.
+        """
+        waited = await self.rate_limiter.acquire()
+        logger.debug(f'{method_name}: waited {waited:.3f} s in rate limiter queue')
+        self.metrics.observe_queue_wait(method_name, waited)
+
+        self.metrics.track_inflight(method_name, 1)
+        started = self._last_request_at = monotonic()
         try:
-            async with session.get(url, params=prepared_params) as response:
+            async with session.get(url, params=params, **request_kwargs) as response:
+                if response.status == 429:
+                    self.metrics.inc_error(method_name, 'throttled')
+                    retry_after = response.headers.get('Retry-After')
+                    self.rate_limiter.on_throttled(
+                        float(retry_after) if retry_after and retry_after.isdigit() else None
+                    )
+                    raise Proxy6TransientError(
+                        f'Rate limit exceeded while calling {method_name}',
+                        throttled=True
+                    )
+
+                if response.status >= 500:
+                    self.metrics.inc_error(method_name, 'http')
+                    raise Proxy6TransientError(
+                        f'HTTP error while calling {method_name}: {response.status} {response.reason}'
+                    )
+
                 response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
+                body = await response.read()
+        except aiohttp.ClientResponseError as e:
+            self.metrics.inc_error(method_name, 'http')
             raise Proxy6Error(f'HTTP error while calling {method_name}: {e}')
+        except aiohttp.ClientError as e:
+            self.metrics.inc_error(
+                method_name, 'timeout' if isinstance(e, asyncio.TimeoutError) else 'http'
+            )
+            raise Proxy6TransientError(f'HTTP error while calling {method_name}: {e}')
+        except asyncio.TimeoutError as e:
+            self.metrics.inc_error(method_name, 'timeout')
+            raise Proxy6TransientError(f'Timeout while calling {method_name}') from e
+        finally:
+            self.metrics.track_inflight(method_name, -1)
+            self.metrics.observe_latency(method_name, monotonic() - started)
+
+        self.metrics.add_bytes(method_name, len(body))
+
+        try:
+            data = self.loads(body)
+        except ValueError:
+            self.metrics.inc_error(method_name, 'invalid_json')
+            raise Proxy6Error(f'Invalid JSON response from API while calling {method_name}')
+
+        if isinstance(data, dict) and data.get('status') != 'yes':
+            self.metrics.inc_error(method_name, 'api')
+
+        self.rate_limiter.on_success()
+        return data
 
 
     def __check_status(self, data: dict) -> None:
@@ -619,6 +1143,57 @@ class AsyncProxy6:
         self.__check_status(data)
         return data['list']
         
+    async def iter_proxies(self, *, state: str = 'all', descr: str = None,
+                           limit: int = 1000, prefetch: bool = True) -> AsyncIterator[dict]:
+        """
+        Постранично обходит все прокси аккаунта и отдаёт их по одному.
+
+        Пока обрабатывается текущая страница, следующая может загружаться
+        в фоне (``prefetch``). В памяти одновременно находится не больше
+        двух страниц, поэтому потребление памяти не растёт вместе с аккаунтом.
+
+        Parameters
+        ----------
+        state : str, optional
+            Состояние прокси: 'active', 'expired', 'expiring' или 'all' (по умолчанию 'all').
+        descr : str, optional
+            Технический комментарий, указанный при покупке прокси.
+        limit : int, optional
+            Размер страницы (по умолчанию 1000, максимальный).
+        prefetch : bool, optional
+            Загружать следующую страницу заранее (по умолчанию True).
+
+        Yields
+        ------
+        dict
+            Данные одного прокси.
+        """
+        def fetch(page: int):
+            coro = self.get_proxy(state=state, descr=descr, page=page, limit=limit)
+            return asyncio.ensure_future(coro) if prefetch else coro
+
+        page = 1
+        pending = fetch(page)
+        try:
+            while pending is not None:
+                proxies = await pending
+                pending = None
+                # На пустой странице API возвращает [] вместо {}
+                items = proxies.values() if isinstance(proxies, dict) else proxies
+
+                if len(items) >= limit:
+                    page += 1
+                    pending = fetch(page)
+
+                for item in items:
+                    yield item
+        finally:
+            # Потребитель мог прервать обход — не оставляем висящий запрос
+            if isinstance(pending, asyncio.Future):
+                pending.cancel()
+            elif pending is not None:
+                pending.close()
+        
     async def set_type(self, *, ids: tuple, type: str) -> bool:
         """
         Изменяет тип (протокол) ваших прокси.
@@ -765,7 +1340,157 @@ class AsyncProxy6:
         data = await self.__make_request('check', ids=ids, proxy=proxy)
 
         self.__check_status(data)
-        return data['proxy_status']
+        return parse_proxy_status(data['proxy_status'])
+
+    async def prolong_bulk(self, *, period: int, ids: Iterable[int]) -> bool:
+        """
+        Продлевает любое количество прокси.
+
+        ID разбиваются на пакеты безопасной для URL длины, пакеты
+        отправляются параллельно в пределах rate limiter.
+
+        Parameters
+        ----------
+        period : int
+            Период продления в днях (обязательный параметр).
+        ids : Iterable[int]
+            Внутренние номера прокси в системе (обязательный параметр).
+
+        Returns
+        -------
+        True, если все пакеты продлены успешно.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        await self.__run_chunks(ids, lambda chunk: self.prolong(period=period, ids=chunk))
+        return True
+
+    async def set_type_bulk(self, *, ids: Iterable[int], type: str) -> bool:
+        """
+        Изменяет тип (протокол) любого количества прокси пакетами.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            Внутренние номера прокси в системе (обязательный параметр).
+        type : str
+            Устанавливаемый тип: 'http' - HTTPS, или 'socks' - SOCKS5 (обязательный параметр).
+
+        Returns
+        -------
+        True, если все пакеты обработаны успешно.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        await self.__run_chunks(ids, lambda chunk: self.set_type(ids=chunk, type=type))
+        return True
+
+    async def set_descr_bulk(self, *, new: str, ids: Iterable[int]) -> tuple:
+        """
+        Обновляет технический комментарий любого количества прокси пакетами.
+
+        Parameters
+        ----------
+        new : str
+            Новый технический комментарий, макс. 50 символов (обязательный параметр).
+        ids : Iterable[int]
+            Внутренние номера прокси в системе (обязательный параметр).
+
+        Returns
+        -------
+        tuple
+            (True, count), если успешно. count - суммарное число обновленных прокси.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        results = await self.__run_chunks(ids, lambda chunk: self.set_descr(new=new, ids=chunk))
+        return True, sum(int(count) for _, count in results)
+
+    async def delete_bulk(self, *, ids: Iterable[int]) -> bool:
+        """
+        Удаляет любое количество прокси пакетами.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            Внутренние номера прокси в системе (обязательный параметр).
+
+        Returns
+        -------
+        True, если все пакеты удалены успешно.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть пакетов не удалось обработать.
+        """
+        await self.__run_chunks(ids, lambda chunk: self.delete(ids=chunk))
+        return True
+
+    async def check_bulk(self, *, ids: Iterable[int]) -> dict[int, bool]:
+        """
+        Проверяет валидность нескольких прокси параллельно.
+
+        Метод API ``check`` принимает один ID, поэтому запросы
+        отправляются по одному на прокси в пределах rate limiter.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            Внутренние номера прокси в системе.
+
+        Returns
+        -------
+        dict[int, bool]
+            Результат проверки для каждого ID.
+
+        Raises
+        ------
+        Proxy6BulkError
+            Если часть прокси проверить не удалось.
+        """
+        ids = tuple(dict.fromkeys(ids))
+        results = await self.__gather_chunks(
+            [(proxy_id,) for proxy_id in ids],
+            lambda chunk: self.check(ids=chunk[0])
+        )
+        return dict(zip(ids, results))
+
+    async def __run_chunks(self, ids: Iterable[int], call) -> list:
+        """
+        Разбивает ID на пакеты и параллельно выполняет ``call`` для каждого.
+        """
+        return await self.__gather_chunks(chunk_ids(ids), call)
+
+    async def __gather_chunks(self, chunks: list[tuple[int, ...]], call) -> list:
+        """
+        Параллельно выполняет ``call`` для каждого пакета и собирает результаты.
+
+        Ошибка одного пакета не отменяет остальные; после завершения всех
+        пакетов выбрасывается ``Proxy6BulkError`` со списком неуспешных ID.
+        """
+        results = await asyncio.gather(*(call(chunk) for chunk in chunks), return_exceptions=True)
+
+        failed_ids: list[int] = []
+        errors: list[BaseException] = []
+        for chunk, result in zip(chunks, results):
+            # CancelledError наследует только BaseException
+            if isinstance(result, BaseException):
+                failed_ids.extend(chunk)
+                errors.append(result)
+
+        if errors:
+            raise Proxy6BulkError(tuple(failed_ids), errors)
+        return results
 
     async def info(self) -> dict:
         """
@@ -782,12 +1507,68 @@ class AsyncProxy6:
             При сетевой ошибке или ошибке API.
         """
         session = await self.__get_session()
-        async with session.get(f'https://px6.link/api/{self.api}') as response:
+        async with session.get(f'{self.base_url}/{self.api}') as response:
             response.raise_for_status()
-            return await response.json()
+            return self.loads(await response.read())
+
+    async def ping(self) -> bool:
+        """
+        Открывает (или поддерживает открытым) соединение с px6.link.
+
+        Выполняет лёгкий запрос информации об аккаунте, чтобы DNS-запрос,
+        TCP- и TLS-рукопожатие были выполнены заранее, а соединение
+        осталось в пуле для следующего запроса пользователя.
+
+        Returns
+        -------
+        bool
+            True, если запрос выполнен успешно.
+        """
+        session = await self.__get_session()
+        await self.rate_limiter.acquire()
+
+        self._last_request_at = monotonic()
+        try:
+            async with session.get(f'{self.base_url}/{self.api}') as response:
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f'Proxy6 ping failed: {e!r}')
+            return False
+
+        return True
+
+    def start_keepalive(self, interval: float = 45) -> None:
+        """
+        Запускает фоновую задачу, которая пингует API после простоя,
+        чтобы соединение в пуле не закрывалось.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Интервал простоя в секундах, после которого выполняется пинг.
+            Должен быть меньше ``keepalive_timeout``. По умолчанию 45.
+        """
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self.__keepalive_loop(interval))
+
+    async def __keepalive_loop(self, interval: float) -> None:
+        while True:
+            idle = monotonic() - self._last_request_at
+            if idle >= interval:
+                await self.ping()
+                idle = 0
+            await asyncio.sleep(interval - idle)
 
     async def close(self):
         """Закрывает сессию вручную."""
+        if self._keepalive_task:
+            # Пинг мог быть в процессе: сессия закрывается только после его отмены
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
         if self.session:
             await self.session.close()
             self.session = None
\ No newline at end of file
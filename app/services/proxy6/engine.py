@@ -1,12 +1,15 @@
-from config import PROXY_API_KEY
+from config import PROXY_API_KEY, PROXY6_BASE_URL
 
 from app.services.proxy6.client import AsyncProxy6
 
 
-proxy_client = AsyncProxy6(PROXY_API_KEY)
+proxy_client = AsyncProxy6(PROXY_API_KEY, base_url=PROXY6_BASE_URL)
 
 async def on_startup():
     await proxy_client.__aenter__()
+    # Прогреваем соединение, чтобы первый пользователь не ждал DNS и TLS
+    await proxy_client.ping()
+    proxy_client.start_keepalive()
     print('Proxy6 client STARTED')
 
 async def on_shutdown():
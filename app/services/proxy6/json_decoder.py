@@ -0,0 +1,32 @@
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # orjson — необязательная зависимость
+    orjson = None
+
+
+JSONLoads = Callable[[bytes | str], Any]
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def get_default_loads() -> JSONLoads:
+    """
+    Возвращает самый быстрый доступный декодер JSON.
+
+    Если установлен ``orjson``, используется он, иначе — стандартный ``json``.
+    Оба декодера принимают ``bytes`` и при ошибке выбрасывают ``ValueError``.
+
+    Returns
+    -------
+    JSONLoads
+        Функция декодирования JSON.
+    """
+    return orjson.loads if orjson is not None else _stdlib_loads
+
+
+default_loads: JSONLoads = get_default_loads()
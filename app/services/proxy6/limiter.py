@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from time import monotonic
+from dataclasses import dataclass
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterStats:
+    acquired: int = 0
+    throttled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Адаптивный ограничитель частоты запросов (token bucket) для API Proxy6.
+
+    Перед каждым запросом вызывающая сторона забирает из «ведра» один токен.
+    Токены пополняются со скоростью ``rate`` в секунду, но не больше ``burst``.
+    Если API отвечает 429, скорость уменьшается в ``decrease_factor`` раз,
+    а после каждого успешного ответа плавно растёт на ``increase_step``
+    до исходного значения (AIMD).
+
+    Parameters
+    ----------
+    rate : float, optional
+        Максимальное число запросов в секунду. По умолчанию 3
+        (лимит API Proxy6).
+    burst : int, optional
+        Ёмкость ведра — сколько запросов можно отправить подряд без ожидания.
+    min_rate : float, optional
+        Нижняя граница скорости после серии ответов 429.
+    decrease_factor : float, optional
+        Множитель скорости при получении 429.
+    increase_step : float, optional
+        Прирост скорости (запросов в секунду) после успешного ответа.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 3.0,
+        burst: int = 3,
+        min_rate: float = 0.5,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.1,
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+
+        self.stats = LimiterStats()
+
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._last_decrease = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Ожидает свободный токен и забирает его.
+
+        Ожидающие обслуживаются в порядке очереди (FIFO), поэтому
+        покупка не «застрянет» за потоком запросов цен.
+
+        Returns
+        -------
+        float
+            Время ожидания в очереди в секундах.
+        """
+        start = monotonic()
+
+        async with self._lock:
+            while True:
+                now = monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        waited = monotonic() - start
+
+        self.stats.acquired += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+
+        return waited
+
+    def on_success(self) -> None:
+        """
+        Плавно восстанавливает скорость после успешного ответа API.
+        """
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttled(self, retry_after: float | None = None) -> None:
+        """
+        Снижает скорость после ответа 429 (Too Many Requests).
+
+        Несколько 429, пришедших в течение секунды (ответы на запросы,
+        отправленные ещё до снижения), уменьшают скорость только один раз.
+
+        Parameters
+        ----------
+        retry_after : float | None, optional
+            Значение заголовка ``Retry-After`` в секундах, если сервер его прислал.
+        """
+        now = monotonic()
+        self.stats.throttled += 1
+
+        if now - self._last_decrease >= max(1.0, 1 / self.rate):
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._last_decrease = now
+            logger.warning(f'Proxy6 rate limit hit, rate lowered to {self.rate:.2f} req/s')
+
+        self._refill(now)
+        self._tokens = 0.0
+        if retry_after:
+            # Отрицательный запас токенов заставит следующих ждать retry_after секунд
+            self._tokens = -retry_after * self.rate
+
+
+proxy6_limiter = AdaptiveRateLimiter()
@@ -0,0 +1,152 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class Histogram:
+    """
+    Гистограмма значений с фиксированными границами корзин (в секундах).
+
+    Последняя корзина — всё, что больше последней границы.
+    """
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(init=False)
+    count: int = 0
+    total: float = 0.0
+    max_value: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max_value = max(self.max_value, value)
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценка квантиля сверху: граница корзины, в которую попадает квантиль.
+
+        Parameters
+        ----------
+        q : float
+            Квантиль от 0 до 1, например 0.95.
+
+        Returns
+        -------
+        float
+            Верхняя граница корзины; для последней корзины — максимум.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max_value
+
+
+class MetricsSink:
+    """
+    Приёмник метрик клиента Proxy6.
+
+    Базовая реализация ничего не делает; чтобы отправлять метрики
+    в Prometheus, StatsD и т.п., достаточно переопределить нужные методы.
+
+    Виды ошибок (``kind``):
+    - ``http`` — сетевая ошибка или HTTP-статус 4xx/5xx;
+    - ``timeout`` — таймаут запроса;
+    - ``throttled`` — ответ 429;
+    - ``api`` — API ответил со статусом, отличным от ``yes``;
+    - ``invalid_json`` — ответ не удалось разобрать;
+    - ``circuit_open`` — запрос отклонён автоматическим выключателем.
+    """
+
+    def observe_latency(self, method: str, seconds: float) -> None:
+        """Длительность одного HTTP-запроса, без ожидания в rate limiter."""
+
+    def observe_queue_wait(self, method: str, seconds: float) -> None:
+        """Время ожидания запроса в очереди rate limiter."""
+
+    def track_inflight(self, method: str, delta: int) -> None:
+        """Изменение числа выполняющихся запросов (+1 / -1)."""
+
+    def inc_error(self, method: str, kind: str) -> None:
+        """Ошибка запроса указанного вида."""
+
+    def add_bytes(self, method: str, size: int) -> None:
+        """Размер полученного тела ответа в байтах."""
+
+
+class InMemoryMetrics(MetricsSink):
+    """
+    Приёмник метрик, хранящий их в памяти процесса.
+
+    Используется по умолчанию; текущие значения можно получить
+    через ``snapshot()``.
+    """
+
+    def __init__(self) -> None:
+        self.latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.queue_wait: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.inflight: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.bytes_received: Counter = Counter()
+
+    def observe_latency(self, method: str, seconds: float) -> None:
+        self.latency[method].observe(seconds)
+
+    def observe_queue_wait(self, method: str, seconds: float) -> None:
+        self.queue_wait[method].observe(seconds)
+
+    def track_inflight(self, method: str, delta: int) -> None:
+        self.inflight[method] += delta
+
+    def inc_error(self, method: str, kind: str) -> None:
+        self.errors[(method, kind)] += 1
+
+    def add_bytes(self, method: str, size: int) -> None:
+        self.bytes_received[method] += size
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Возвращает сводку метрик по каждому методу API.
+
+        Returns
+        -------
+        dict[str, dict]
+            ``{method: {requests, avg, p50, p95, p99, max, queue_wait_avg,
+            inflight, bytes, errors: {kind: count}}}``, время в секундах.
+        """
+        methods = set(self.latency) | set(self.inflight) | {method for method, _ in self.errors}
+
+        result = {}
+        for method in sorted(methods):
+            latency = self.latency[method]
+            result[method] = {
+                'requests': latency.count,
+                'avg': latency.avg,
+                'p50': latency.quantile(0.5),
+                'p95': latency.quantile(0.95),
+                'p99': latency.quantile(0.99),
+                'max': latency.max_value,
+                'queue_wait_avg': self.queue_wait[method].avg,
+                'inflight': self.inflight[method],
+                'bytes': self.bytes_received[method],
+                'errors': {
+                    kind: count for (name, kind), count in self.errors.items() if name == method
+                },
+            }
+        return result
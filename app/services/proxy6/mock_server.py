@@ -0,0 +1,461 @@
+"""
+Локальный заменитель API Proxy6 для тестов и нагрузочных прогонов.
+
+Реализует методы getprice, getcount, getcountry, getproxy, buy, prolong,
+delete, check, settype и setdescr с ответами той же структуры, что
+и у px6.link (см. helper.md). Позволяет задавать задержку ответов, долю
+ошибок 5xx и ответов 429.
+
+Запуск:
+    python -m app.services.proxy6.mock_server --port 8080 --latency 0.2
+
+После чего клиент направляется на сервер через ``base_url``:
+    AsyncProxy6('key', base_url='http://127.0.0.1:8080/api')
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import string
+from collections import Counter
+from datetime import datetime
+from time import monotonic, time
+
+from aiohttp import web
+
+
+logger = logging.getLogger(__name__)
+
+
+UNIT_PRICES = {4: 1.7, 3: 0.9, 6: 0.3}  # руб. за прокси в день
+COUNTRIES = {
+    4: ['ru', 'us', 'de', 'gb', 'nl', 'fr', 'ua', 'kz'],
+    3: ['ru', 'us', 'de', 'nl'],
+    6: ['ru', 'us', 'de', 'gb', 'nl', 'fr', 'jp', 'ca', 'au', 'sg'],
+}
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class MockProxy6Server:
+    """
+    Заменитель API Proxy6 на aiohttp с состоянием в памяти.
+
+    Parameters
+    ----------
+    latency : float, optional
+        Средняя задержка ответа в секундах.
+    jitter : float, optional
+        Случайный разброс задержки в секундах (±).
+    error_rate : float, optional
+        Доля запросов, завершающихся ответом 500.
+    throttle_rate : float, optional
+        Доля запросов, на которые случайно отвечается 429.
+    rate_limit : float | None, optional
+        Разрешённое число запросов в секунду; при превышении — 429.
+        ``None`` — без ограничения.
+    balance : float, optional
+        Начальный баланс аккаунта в рублях.
+    stock : int, optional
+        Количество доступных прокси в каждой стране.
+    seed : int | None, optional
+        Зерно генератора случайных чисел для воспроизводимых прогонов.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: float | None = None,
+        balance: float = 100_000.0,
+        stock: int = 5000,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+
+        self.balance = balance
+        self.stock = {
+            (version, country): stock
+            for version, countries in COUNTRIES.items()
+            for country in countries
+        }
+        self.proxies: dict[str, dict] = {}
+        self.calls: Counter = Counter()
+
+        self._random = random.Random(seed)
+        self._next_id = 36253668
+        self._next_order_id = 13687678
+        self._window: list[float] = []
+        self._runner: web.AppRunner | None = None
+
+        self.base_url: str | None = None
+
+    # ---------------------------------------------------------------- server
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/api/{key}', self._handle_info)
+        app.router.add_get('/api/{key}/', self._handle_info)
+        app.router.add_get('/api/{key}/{method}', self._handle_method)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        Запускает сервер.
+
+        Parameters
+        ----------
+        host : str, optional
+            Адрес для прослушивания.
+        port : int, optional
+            Порт; 0 — выбрать свободный порт автоматически.
+
+        Returns
+        -------
+        str
+            Базовый URL API для параметра ``base_url`` клиентов Proxy6.
+        """
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.base_url = f'http://{host}:{port}/api'
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'MockProxy6Server':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    # -------------------------------------------------------------- handlers
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        self.calls['info'] += 1
+        return web.json_response(self._ok())
+
+    async def _handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        self.calls[method] += 1
+
+        if self.latency or self.jitter:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            await asyncio.sleep(max(0.0, delay))
+
+        if self._is_rate_limited() or self._random.random() < self.throttle_rate:
+            self.calls['429'] += 1
+            return web.json_response({'error': 'Too Many Requests'}, status=429)
+
+        if self._random.random() < self.error_rate:
+            self.calls['500'] += 1
+            return web.json_response({'error': 'Internal Server Error'}, status=500)
+
+        handler = getattr(self, f'_api_{method}', None)
+        if handler is None:
+            return web.json_response(self._error(1, 'Error key'))
+
+        params = dict(request.query)
+        try:
+            data = handler(params)
+        except (KeyError, ValueError) as e:
+            data = self._error(200, f'Error param {e}')
+
+        return web.json_response(data)
+
+    def _is_rate_limited(self) -> bool:
+        if not self.rate_limit:
+            return False
+
+        now = monotonic()
+        self._window = [t for t in self._window if now - t < 1.0]
+        if len(self._window) >= self.rate_limit:
+            return True
+        self._window.append(now)
+        return False
+
+    # ----------------------------------------------------------- API methods
+
+    def _api_getprice(self, params: dict) -> dict:
+        count = int(params['count'])
+        period = int(params['period'])
+        version = int(params.get('version', 6))
+        price_single = round(UNIT_PRICES[version] * period, 2)
+
+        return self._ok(
+            price=round(price_single * count, 2),
+            price_single=price_single,
+            period=period,
+            count=count,
+        )
+
+    def _api_getcount(self, params: dict) -> dict:
+        version = int(params.get('version', 6))
+        country = params['country']
+        return self._ok(count=self.stock.get((version, country), 0))
+
+    def _api_getcountry(self, params: dict) -> dict:
+        version = int(params.get('version', 6))
+        return self._ok(list=COUNTRIES[version])
+
+    def _api_getproxy(self, params: dict) -> dict:
+        state = params.get('state', 'all')
+        descr = params.get('descr')
+        page = int(params.get('page', 1))
+        limit = min(int(params.get('limit', 1000)), 1000)
+
+        now = time()
+        proxies = [
+            proxy for proxy in self.proxies.values()
+            if (descr is None or proxy['descr'] == descr)
+            and (
+                state == 'all'
+                or (state == 'active' and proxy['unixtime_end'] > now)
+                or (state == 'expired' and proxy['unixtime_end'] <= now)
+                or (state == 'expiring' and now < proxy['unixtime_end'] <= now + 86400)
+            )
+        ]
+        page_items = proxies[(page - 1) * limit:page * limit]
+
+        return self._ok(
+            list_count=len(page_items),
+            # Как и настоящий API, на пустой странице возвращаем список
+            list={proxy['id']: proxy for proxy in page_items} if page_items else [],
+        )
+
+    def _api_buy(self, params: dict) -> dict:
+        count = int(params['count'])
+        period = int(params['period'])
+        country = params['country']
+        version = int(params.get('version', 6))
+        proxy_type = params.get('type', 'http')
+        descr = params.get('descr', '')
+
+        if count < 1:
+            return self._error(200, 'Error count')
+        if period < 3:
+            return self._error(210, 'Error period')
+        if country not in COUNTRIES[version]:
+            return self._error(110, 'Error country')
+        if count > self.stock[(version, country)]:
+            return self._error(300, 'Error active-proxy-allow')
+
+        price = round(UNIT_PRICES[version] * period * count, 2)
+        if price > self.balance:
+            return self._error(400, 'Error no money')
+        self.balance = round(self.balance - price, 2)
+        self.stock[(version, country)] -= count
+
+        now = int(time())
+        bought = {}
+        for _ in range(count):
+            proxy = self._make_proxy(now, period, version, proxy_type, country, descr)
+            self.proxies[proxy['id']] = proxy
+            bought[proxy['id']] = {key: value for key, value in proxy.items()
+                                   if key not in ('country', 'descr')}
+
+        return self._ok(
+            order_id=self._order_id(),
+            count=str(count),
+            price=f'{price:.2f}',
+            period=str(period),
+            version=str(version),
+            type=proxy_type,
+            country=country,
+            list=bought,
+        )
+
+    def _api_prolong(self, params: dict) -> dict:
+        period = int(params['period'])
+        ids = self._parse_ids(params['ids'])
+
+        price = 0.0
+        prolonged = {}
+        for proxy_id in ids:
+            proxy = self.proxies.get(proxy_id)
+            if proxy is None:
+                return self._error(220, 'Error ids')
+            price += UNIT_PRICES[int(proxy['version'])] * period
+
+        if price > self.balance:
+            return self._error(400, 'Error no money')
+        self.balance = round(self.balance - price, 2)
+
+        for proxy_id in ids:
+            proxy = self.proxies[proxy_id]
+            proxy['unixtime_end'] += period * 86400
+            proxy['date_end'] = self._format(proxy['unixtime_end'])
+            prolonged[proxy_id] = {
+                'id': proxy_id,
+                'date_end': proxy['date_end'],
+                'unixtime_end': proxy['unixtime_end'],
+            }
+
+        return self._ok(
+            order_id=self._order_id(),
+            price=f'{price:.2f}',
+            period=period,
+            count=len(prolonged),
+            list=prolonged,
+        )
+
+    def _api_delete(self, params: dict) -> dict:
+        if 'ids' in params:
+            ids = [i for i in self._parse_ids(params['ids']) if i in self.proxies]
+        elif 'descr' in params:
+            ids = [i for i, p in self.proxies.items() if p['descr'] == params['descr']]
+        else:
+            return self._error(220, 'Error ids')
+
+        for proxy_id in ids:
+            del self.proxies[proxy_id]
+        return self._ok(count=len(ids))
+
+    def _api_check(self, params: dict) -> dict:
+        if 'ids' in params:
+            proxy_id = params['ids']
+            if proxy_id not in self.proxies:
+                return self._error(220, 'Error ids')
+        elif 'proxy' in params:
+            proxy_id = None
+        else:
+            return self._error(220, 'Error ids')
+
+        return self._ok(proxy_id=proxy_id, proxy_status=True)
+
+    def _api_settype(self, params: dict) -> dict:
+        proxy_type = params['type']
+        if proxy_type not in ('http', 'socks'):
+            return self._error(250, 'Error type')
+
+        for proxy_id in self._parse_ids(params['ids']):
+            if proxy_id in self.proxies:
+                self.proxies[proxy_id]['type'] = proxy_type
+        return self._ok()
+
+    def _api_setdescr(self, params: dict) -> dict:
+        new = params['new']
+        if 'ids' in params:
+            ids = [i for i in self._parse_ids(params['ids']) if i in self.proxies]
+        elif 'old' in params:
+            ids = [i for i, p in self.proxies.items() if p['descr'] == params['old']]
+        else:
+            return self._error(220, 'Error ids')
+
+        for proxy_id in ids:
+            self.proxies[proxy_id]['descr'] = new
+        return self._ok(count=len(ids))
+
+    # --------------------------------------------------------------- helpers
+
+    def _ok(self, **data) -> dict:
+        return {
+            'status': 'yes',
+            'user_id': '639793',
+            'balance': f'{self.balance:.2f}',
+            'currency': 'RUB',
+            'date_mod': self._format(time()),
+            **data,
+        }
+
+    @staticmethod
+    def _error(error_id: int, error: str) -> dict:
+        return {'status': 'no', 'error_id': error_id, 'error': error}
+
+    @staticmethod
+    def _parse_ids(ids: str) -> list[str]:
+        return [proxy_id for proxy_id in ids.split(',') if proxy_id]
+
+    @staticmethod
+    def _format(unixtime: float) -> str:
+        return datetime.fromtimestamp(unixtime).strftime(DATE_FORMAT)
+
+    def _order_id(self) -> int:
+        self._next_order_id += 1
+        return self._next_order_id
+
+    def _make_proxy(
+        self,
+        now: int,
+        period: int,
+        version: int,
+        proxy_type: str,
+        country: str,
+        descr: str
+    ) -> dict:
+        self._next_id += 1
+        proxy_id = str(self._next_id)
+        alphabet = string.ascii_letters + string.digits
+
+        if version == 6:
+            ip = ':'.join(f'{self._random.getrandbits(16):04x}' for _ in range(8))
+        else:
+            ip = '.'.join(str(self._random.randint(1, 254)) for _ in range(4))
+
+        return {
+            'id': proxy_id,
+            'ip': ip,
+            'host': f'45.145.{self._random.randint(0, 255)}.{self._random.randint(1, 254)}',
+            'port': str(self._random.randint(10000, 65000)),
+            'user': ''.join(self._random.choices(alphabet, k=6)),
+            'pass': ''.join(self._random.choices(alphabet, k=6)),
+            'type': proxy_type,
+            'version': str(version),
+            'country': country,
+            'date': self._format(now),
+            'date_end': self._format(now + period * 86400),
+            'unixtime': now,
+            'unixtime_end': now + period * 86400,
+            'descr': descr,
+            'active': '1',
+        }
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = MockProxy6Server(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f'Mock Proxy6 API: {base_url}')
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Локальный заменитель API Proxy6')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        print('Exit')
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import random
+from time import time
+from dataclasses import dataclass
+
+from app.services.proxy6.cache import cache_backend, invalidate_price_cache
+from app.services.proxy6.client import Proxy6Error
+from app.services.proxy6.engine import proxy_client
+
+from config import PRICE_MATRIX_VERIFY_RATE, PRICE_MATRIX_DISABLE_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceMatrixStats:
+    quotes: int = 0
+    samples: int = 0
+    verifications: int = 0
+    mismatches: int = 0
+
+
+class PriceMatrix:
+    """
+    Матрица цен: вычисляет стоимость любой комбинации (количество, период)
+    локально по выученной цене одного прокси.
+
+    Цена у Proxy6 линейна по количеству, поэтому для каждой пары
+    (версия, период) достаточно одного запроса ``getprice`` с ``count=1``:
+    стоимость N прокси = N × цена одного. Выученная цена действует ``ttl``
+    секунд, после чего запрашивается заново. Скидки за объём или округление
+    у API могут нарушить линейность, поэтому цена нескольких прокси — только
+    оценка для показа: счёт выставляется по точной цене API.
+
+    Доля ``verify_rate`` локальных ответов в фоне сверяется с живым API.
+    Если цена расходится больше чем на ``tolerance``, матрица для этой
+    версии отключается (``quote`` возвращает ``None``), уже рассчитанные
+    по ней цены удаляются из кэша цен, и вызывающий код переходит на точные
+    запросы к API. Через ``disable_timeout`` секунд матрица для версии
+    включается снова и заново выучивает цену одного прокси.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Срок действия выученной цены в секундах. По умолчанию сутки.
+    verify_rate : float, optional
+        Доля ответов, сверяемых с API (0 — не сверять).
+    tolerance : float, optional
+        Допустимое относительное расхождение с API.
+    disable_timeout : float, optional
+        Через сколько секунд отключённая матрица включается снова.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 24 * 60 * 60,
+        verify_rate: float = PRICE_MATRIX_VERIFY_RATE,
+        tolerance: float = 0.005,
+        disable_timeout: float = PRICE_MATRIX_DISABLE_TIMEOUT
+    ) -> None:
+        self.ttl = ttl
+        self.verify_rate = verify_rate
+        self.tolerance = tolerance
+        self.disable_timeout = disable_timeout
+
+        self.stats = PriceMatrixStats()
+        # Версия -> время отключения матрицы
+        self.disabled_versions: dict[int, float] = {}
+
+        self._unit_prices: dict[tuple[int, int], tuple[float, float]] = {}
+        self._background: set[asyncio.Task] = set()
+
+    async def quote(self, *, proxy_version: int, count: int, period: int) -> float | None:
+        """
+        Возвращает стоимость прокси в рублях, рассчитанную по матрице.
+
+        Parameters
+        ----------
+        proxy_version : int
+            Версия прокси (4 — IPv4, 3 — IPv4 Shared, 6 — IPv6).
+        count : int
+            Количество прокси.
+        period : int
+            Период аренды в днях.
+
+        Returns
+        -------
+        float | None
+            Стоимость в рублях или ``None``, если матрица для версии
+            отключена после расхождения с API.
+
+        Raises
+        ------
+        Proxy6Error
+            Если не удалось запросить цену одного прокси.
+        """
+        disabled_at = self.disabled_versions.get(proxy_version)
+        if disabled_at is not None:
+            if time() - disabled_at < self.disable_timeout:
+                return None
+            self.enable(proxy_version)
+
+        unit_price = await self.unit_price(proxy_version=proxy_version, period=period)
+        price_rub = round(unit_price * count, 2)
+        self.stats.quotes += 1
+
+        if count > 1 and self.verify_rate and random.random() < self.verify_rate:
+            task = asyncio.create_task(self._verify(proxy_version, count, period, price_rub))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        return price_rub
+
+    async def unit_price(self, *, proxy_version: int, period: int) -> float:
+        """
+        Возвращает цену одного прокси на ``period`` дней, при необходимости
+        запрашивая её у API.
+        """
+        key = (proxy_version, period)
+        learned = self._unit_prices.get(key)
+        if learned and time() - learned[1] < self.ttl:
+            return learned[0]
+
+        # Одновременные запросы одной цены объединяет single-flight клиента,
+        # а между воркерами — общий кэш-бэкенд
+        price_rub = float(await cache_backend.get_or_load(
+            f'unit_price:{proxy_version}:{period}',
+            lambda: proxy_client.get_price(count=1, period=period, version=proxy_version),
+            ttl=self.ttl
+        ))
+        self._unit_prices[key] = (price_rub, time())
+        self.stats.samples += 1
+
+        return price_rub
+
+    def items(self) -> list[tuple[tuple[int, int], float, float]]:
+        """
+        Возвращает выученные цены: ``((версия, период), цена, время получения)``.
+        """
+        return [(key, price, learned_at) for key, (price, learned_at) in self._unit_prices.items()]
+
+    def set(self, proxy_version: int, period: int, unit_price: float, learned_at: float) -> None:
+        self._unit_prices[(proxy_version, period)] = (unit_price, learned_at)
+
+    def clear(self) -> None:
+        self._unit_prices.clear()
+
+    def enable(self, proxy_version: int) -> None:
+        """
+        Снова включает матрицу для версии после расхождения с API.
+
+        Выученные цены версии сбрасываются, поэтому цена одного прокси
+        будет запрошена заново.
+        """
+        self.disabled_versions.pop(proxy_version, None)
+        self._drop_unit_prices(proxy_version)
+
+    def _drop_unit_prices(self, proxy_version: int) -> None:
+        for key in [key for key in self._unit_prices if key[0] == proxy_version]:
+            del self._unit_prices[key]
+
+    async def _verify(self, proxy_version: int, count: int, period: int, price_rub: float) -> None:
+        try:
+            live_price = float(await proxy_client.get_price(count=count, period=period, version=proxy_version))
+        except Proxy6Error as e:
+            logger.info(f'Price matrix verification skipped: {e}')
+            return
+
+        self.stats.verifications += 1
+        if abs(live_price - price_rub) > self.tolerance * max(live_price, 0.01):
+            self.stats.mismatches += 1
+            self.disabled_versions[proxy_version] = time()
+            self._drop_unit_prices(proxy_version)
+            logger.warning(
+                f'Price matrix disabled for version {proxy_version}: '
+                f'{count} x {period} days quoted {price_rub}, API says {live_price}'
+            )
+            # Цены, уже рассчитанные по матрице, больше не должны показываться,
+            # а после включения цена одного прокси запрашивается у API заново
+            await invalidate_price_cache(proxy_version)
+            await cache_backend.invalidate(f'unit_price:{proxy_version}:*')
+
+
+price_matrix = PriceMatrix()
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.models import Basket, PriceCache, Spending
+
+from app.services.proxy6.cache import PRICE_TTL, PriceKey, save_price_caches
+from app.services.proxy6.client import Proxy6Error
+from app.services.proxy6.engine import proxy_client
+
+from config import PRICE_WARMER_INTERVAL, PRICE_WARMER_TOP
+
+
+logger = logging.getLogger(__name__)
+
+
+async def get_popular_price_keys(session: AsyncSession, limit: int) -> list[PriceKey]:
+    """
+    Возвращает самые часто запрашиваемые комбинации (версия, количество, период).
+
+    Популярность считается по истории покупок (``Spending``) и текущим
+    корзинам (``Basket``). Для каждой популярной пары (версия, период)
+    дополнительно учитывается количество 1 — по нему считается цена
+    на экране «Купить сейчас».
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Асинхронная SQLAlchemy-сессия.
+    limit : int
+        Максимальное число комбинаций.
+
+    Returns
+    -------
+    list[PriceKey]
+        Комбинации в порядке убывания популярности.
+    """
+    history = union_all(
+        select(Spending.proxy_version, Spending.count, Spending.period),
+        select(Basket.proxy_version, Basket.count, Basket.period),
+    ).subquery()
+
+    rows = await session.execute(
+        select(history.c.proxy_version, history.c.count, history.c.period)
+        .group_by(history.c.proxy_version, history.c.count, history.c.period)
+        .order_by(func.count().desc())
+        .limit(limit)
+    )
+
+    keys: list[PriceKey] = []
+    for version, count, period in rows:
+        for key in ((int(version), int(count), int(period)), (int(version), 1, int(period))):
+            if key not in keys:
+                keys.append(key)
+
+    return keys[:limit]
+
+
+async def refresh_expiring_prices(
+    session: AsyncSession,
+    *,
+    limit: int = PRICE_WARMER_TOP,
+    margin: timedelta = timedelta(seconds=PRICE_WARMER_INTERVAL * 2)
+) -> int:
+    """
+    Обновляет цены популярных комбинаций, которые скоро устареют.
+
+    Обновляются комбинации, которых нет в ``price_cache`` или которые
+    устареют в течение ``margin``. Запросы к Proxy6 выполняются по одному,
+    чтобы фоновая задача не занимала очередь rate limiter перед
+    запросами пользователей.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        Асинхронная SQLAlchemy-сессия.
+    limit : int, optional
+        Сколько самых популярных комбинаций поддерживать в кэше.
+    margin : timedelta, optional
+        За сколько до истечения срока цена обновляется заранее.
+        По умолчанию — два периода запуска прогрева.
+
+    Returns
+    -------
+    int
+        Количество обновлённых цен.
+    """
+    keys = await get_popular_price_keys(session, limit)
+    if not keys:
+        return 0
+
+    rows = await session.execute(
+        select(PriceCache.proxy_version, PriceCache.count, PriceCache.period, PriceCache.updated_at)
+        .where(tuple_(PriceCache.proxy_version, PriceCache.count, PriceCache.period).in_(keys))
+    )
+    updated_at = {(version, count, period): ts for version, count, period, ts in rows}
+
+    deadline = datetime.utcnow() - PRICE_TTL + margin
+    stale = [key for key in keys if key not in updated_at or updated_at[key] <= deadline]
+
+    prices: dict[PriceKey, float] = {}
+    for version, count, period in stale:
+        try:
+            price_rub = await proxy_client.get_price(count=count, period=period, version=version)
+        except (Proxy6Error, asyncio.TimeoutError) as e:
+            # Ошибка или таймаут одной комбинации не прерывает прогрев остальных
+            logger.warning(f'Price warm-up for {(version, count, period)} failed: {e!r}')
+            continue
+
+        prices[(version, count, period)] = float(price_rub)
+
+    # Все обновлённые цены записываются одним upsert
+    await save_price_caches(prices, session)
+
+    return len(prices)
+
+
+class PriceWarmer:
+    """
+    Фоновая задача, периодически прогревающая кэш цен.
+
+    Parameters
+    ----------
+    session_pool : async_sessionmaker
+        Фабрика сессий базы данных.
+    interval : float, optional
+        Период запуска в секундах.
+    limit : int, optional
+        Сколько самых популярных комбинаций поддерживать в кэше.
+    """
+
+    def __init__(
+        self,
+        session_pool: async_sessionmaker,
+        *,
+        interval: float = PRICE_WARMER_INTERVAL,
+        limit: int = PRICE_WARMER_TOP
+    ) -> None:
+        self.session_pool = session_pool
+        self.interval = interval
+        self.limit = limit
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self.session_pool() as session:
+                    refreshed = await refresh_expiring_prices(
+                        session,
+                        limit=self.limit,
+                        margin=timedelta(seconds=self.interval * 2)
+                    )
+                if refreshed:
+                    logger.info(f'Price warm-up: {refreshed} prices refreshed')
+            except Exception:
+                logger.exception('Price warm-up failed')
+
+            await asyncio.sleep(self.interval)
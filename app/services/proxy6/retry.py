@@ -0,0 +1,137 @@
+import logging
+import random
+from time import monotonic
+from dataclasses import dataclass, field
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Политика повторных запросов к API Proxy6.
+
+    Повторяются только временные ошибки (сеть, таймауты, 5xx, 429)
+    и только для методов из ``retry_methods``. Покупка и продление
+    не идемпотентны, поэтому по умолчанию не повторяются — их можно
+    добавить в ``retry_methods`` явно.
+
+    Attributes
+    ----------
+    max_attempts : int
+        Максимальное число попыток, включая первую.
+    base_delay : float
+        Базовая задержка перед повтором в секундах.
+    max_delay : float
+        Верхняя граница задержки в секундах.
+    attempt_timeout : float | None
+        Таймаут одной попытки для повторяемых методов в секундах.
+        ``None`` — использовать таймаут HTTP-сессии.
+    retry_methods : frozenset[str]
+        Методы API, которые разрешено повторять.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 5.0
+    attempt_timeout: float | None = 10.0
+    retry_methods: frozenset[str] = field(
+        default_factory=lambda: frozenset({'getprice', 'getcount', 'getcountry', 'getproxy', 'check'})
+    )
+
+    def is_retryable(self, method_name: str) -> bool:
+        return method_name in self.retry_methods
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Задержка перед следующей попыткой: экспоненциальный рост
+        с полным случайным разбросом (full jitter).
+
+        Parameters
+        ----------
+        attempt : int
+            Номер неудавшейся попытки, начиная с 1.
+
+        Returns
+        -------
+        float
+            Задержка в секундах.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay)
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель (circuit breaker) для API Proxy6.
+
+    После ``failure_threshold`` временных ошибок подряд выключатель
+    размыкается, и в течение ``reset_timeout`` секунд запросы сразу
+    завершаются ошибкой, не дожидаясь таймаута. Затем пропускается один
+    пробный запрос: успех замыкает выключатель, ошибка снова размыкает его.
+
+    Parameters
+    ----------
+    failure_threshold : int, optional
+        Число ошибок подряд, после которого выключатель размыкается.
+    reset_timeout : float, optional
+        Время в секундах, на которое выключатель размыкается.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        """
+        Проверяет, можно ли сейчас отправить запрос.
+
+        Returns
+        -------
+        bool
+            ``True``, если запрос разрешён (в том числе как пробный).
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        if monotonic() - self._opened_at >= self.reset_timeout:
+            # Пропускаем один пробный запрос; если он «потерялся» (например,
+            # был отменён), следующий пробный запрос пройдёт через reset_timeout
+            self.state = self.HALF_OPEN
+            self._opened_at = monotonic()
+            return True
+
+        return False
+
+    def retry_in(self) -> float:
+        """
+        Возвращает, через сколько секунд выключатель пропустит пробный запрос.
+        """
+        if self.state == self.CLOSED:
+            return 0.0
+        return max(0.0, self.reset_timeout - (monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info('Proxy6 circuit breaker closed')
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f'Proxy6 circuit breaker opened for {self.reset_timeout:.0f} s '
+                    f'after {self.failures} failures'
+                )
+            self.state = self.OPEN
+            self._opened_at = monotonic()
@@ -0,0 +1,72 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executed: int = 0
+    deduplicated: int = 0
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые вызовы в один (single-flight).
+
+    Пока выполняется вызов с ключом ``key``, все остальные вызовы с тем же
+    ключом не запускают новую корутину, а ждут результат первой и получают
+    тот же результат или то же исключение. После завершения ключ
+    освобождается, следующий вызов снова выполнится по-настоящему.
+
+    Notes
+    -----
+    Результат разделяется между всеми ожидающими без копирования,
+    поэтому вызывающая сторона не должна его изменять.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет ``func`` или присоединяется к уже выполняющемуся вызову.
+
+        Parameters
+        ----------
+        key : Hashable
+            Ключ, по которому определяются одинаковые вызовы.
+        func : Callable[[], Awaitable[Any]]
+            Фабрика корутины, которая будет выполнена, если для ключа
+            нет активного вызова.
+
+        Returns
+        -------
+        Any
+            Результат ``func``.
+        """
+        self.stats.calls += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.executed += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.stats.deduplicated += 1
+
+        # shield: отмена одного из ожидающих не должна отменять запрос для остальных
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # помечаем исключение как полученное, даже если все ожидающие отменены
+            task.exception()
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+from time import time
+
+from app.services.proxy6.cache import country_cache, price_l1
+from app.services.proxy6.price_matrix import price_matrix
+from app.services.proxy6.stock import stock_index
+
+from config import CACHE_SNAPSHOT_PATH, CACHE_SNAPSHOT_INTERVAL
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+def dump_caches() -> dict:
+    """
+    Собирает содержимое кэшей в памяти в сериализуемый словарь.
+
+    Для каждой записи сохраняется время её получения (или истечения),
+    чтобы после восстановления TTL продолжали отсчитываться от исходного
+    момента, а не от перезапуска.
+
+    Returns
+    -------
+    dict
+        Снимок кэшей: списки стран, L1-кэш цен, матрица цен и остатки.
+    """
+    now = time()
+
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'saved_at': now,
+        'countries': [
+            [version, entry.value, entry.updated_at]
+            for version, entry in country_cache.items()
+        ],
+        'prices': [
+            [*key, price_rub, now + remaining]
+            for key, price_rub, remaining in price_l1.items()
+        ],
+        'price_matrix': [
+            [*key, unit_price, learned_at]
+            for key, unit_price, learned_at in price_matrix.items()
+        ],
+        'stock': {
+            'updated_at': stock_index.updated_at,
+            'counts': [[version, country, count] for (version, country), count in stock_index.items()],
+        },
+    }
+
+
+def restore_caches(snapshot: dict) -> None:
+    """
+    Восстанавливает кэши в памяти из снимка ``dump_caches``.
+
+    Устаревшие цены пропускаются; списки стран восстанавливаются
+    с исходным временем получения, поэтому просроченные сразу
+    обновляются в фоне по правилам ``SWRCache``.
+
+    Parameters
+    ----------
+    snapshot : dict
+        Снимок кэшей.
+    """
+    now = time()
+
+    for version, countries, updated_at in snapshot.get('countries', []):
+        if countries:
+            country_cache.set(version, countries, updated_at)
+
+    for proxy_version, count, period, price_rub, expires_at in snapshot.get('prices', []):
+        if expires_at > now:
+            price_l1.set((proxy_version, count, period), price_rub, ttl=expires_at - now)
+
+    for proxy_version, period, unit_price, learned_at in snapshot.get('price_matrix', []):
+        if now - learned_at < price_matrix.ttl:
+            price_matrix.set(proxy_version, period, unit_price, learned_at)
+
+    stock = snapshot.get('stock') or {}
+    if stock.get('updated_at') is not None:
+        for version, country, count in stock.get('counts', []):
+            stock_index.set(version, country, count)
+        stock_index.updated_at = stock['updated_at']
+
+
+def clear_caches() -> None:
+    """
+    Очищает кэши, которые восстанавливаются из снимка.
+    """
+    country_cache.invalidate()
+    price_l1.invalidate()
+    price_matrix.clear()
+    stock_index.clear()
+
+
+def save_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> None:
+    """
+    Атомарно записывает снимок кэшей в файл.
+    """
+    _write(path, dump_caches())
+
+
+def _write(path: str, snapshot: dict) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> bool:
+    """
+    Загружает снимок кэшей из файла, если он есть.
+
+    Returns
+    -------
+    bool
+        ``True``, если снимок найден и восстановлен.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        logger.warning(f'Cache snapshot {path} is unreadable, starting cold: {e}')
+        return False
+
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        logger.warning(f'Cache snapshot {path} has unsupported format, starting cold')
+        return False
+
+    try:
+        restore_caches(snapshot)
+    except Exception as e:
+        # Снимок читается, но имеет неожиданную структуру: частично
+        # восстановленные данные отбрасываются
+        logger.warning(f'Cache snapshot {path} is malformed, starting cold: {e!r}')
+        clear_caches()
+        return False
+
+    return True
+
+
+class CacheSnapshotter:
+    """
+    Фоновая задача, сохраняющая снимок кэшей в памяти.
+
+    ``start`` восстанавливает кэши из последнего снимка и запускает
+    периодическую запись, ``stop`` останавливает её и записывает
+    финальный снимок. ``start`` нужно зарегистрировать раньше фоновых
+    задач, которые читают эти кэши (например, ``stock_index``).
+
+    Parameters
+    ----------
+    path : str, optional
+        Путь к файлу снимка.
+    interval : float, optional
+        Период записи снимка в секундах.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str = CACHE_SNAPSHOT_PATH,
+        interval: float = CACHE_SNAPSHOT_INTERVAL
+    ) -> None:
+        self.path = path
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        # Снимок небольшой и читается до начала обработки обновлений
+        if load_snapshot(self.path):
+            logger.info(f'Caches restored from {self.path}')
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self._save()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._save()
+
+    async def _save(self) -> None:
+        try:
+            # Снимок собирается в цикле событий, в поток уходит только запись файла
+            snapshot = dump_caches()
+            await asyncio.to_thread(_write, self.path, snapshot)
+        except Exception:
+            logger.exception('Cache snapshot failed')
+
+
+cache_snapshotter = CacheSnapshotter()
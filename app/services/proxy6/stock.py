@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from time import time
+
+from app.services.proxy6.cache import get_countries
+from app.services.proxy6.client import Proxy6Error
+from app.services.proxy6.engine import proxy_client
+
+from config import STOCK_REFRESH_INTERVAL
+
+
+logger = logging.getLogger(__name__)
+
+PROXY_VERSIONS = (4, 3, 6)
+
+
+class StockIndex:
+    """
+    Индекс остатков прокси по (версия, страна) в памяти процесса.
+
+    Остатки запрашиваются через ``getcount`` в фоне раз в ``interval``
+    секунд по одной стране за раз, чтобы фоновые запросы не занимали
+    общий лимит запросов к Proxy6 пачкой и запросы пользователей
+    (``getprice``, ``buy``) проходили между ними. Чтение (``count``,
+    ``available``) никогда не обращается к сети; если остаток ещё
+    не загружен, он считается неизвестным. Ошибка обновления оставляет
+    прежнее значение.
+
+    Parameters
+    ----------
+    interval : float, optional
+        Период обновления в секундах.
+    versions : tuple[int, ...], optional
+        Версии прокси, остатки которых отслеживаются.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = STOCK_REFRESH_INTERVAL,
+        versions: tuple[int, ...] = PROXY_VERSIONS
+    ) -> None:
+        self.interval = interval
+        self.versions = versions
+        self.updated_at: float | None = None
+
+        self._counts: dict[tuple[int, str], int] = {}
+        self._task: asyncio.Task | None = None
+
+    def count(self, version: int, country: str) -> int | None:
+        """
+        Возвращает остаток прокси без обращения к API.
+
+        Returns
+        -------
+        int | None
+            Количество доступных прокси или ``None``, если остаток неизвестен.
+        """
+        return self._counts.get((version, country))
+
+    def available(self, version: int, countries: list[str]) -> dict[str, int]:
+        """
+        Возвращает известные остатки для списка стран одной версии.
+        """
+        return {
+            country: self._counts[(version, country)]
+            for country in countries
+            if (version, country) in self._counts
+        }
+
+    def set(self, version: int, country: str, count: int) -> None:
+        self._counts[(version, country)] = count
+
+    def items(self) -> list[tuple[tuple[int, str], int]]:
+        return list(self._counts.items())
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self.updated_at = None
+
+    async def refresh(self) -> int:
+        """
+        Обновляет остатки по всем странам отслеживаемых версий.
+
+        Returns
+        -------
+        int
+            Количество обновлённых записей.
+        """
+        keys = [
+            (version, country)
+            for version in self.versions
+            for country in await get_countries(version)
+        ]
+
+        refreshed = 0
+        for version, country in keys:
+            # Запросы по одному: ожидание в общем лимитере не растёт пачкой
+            try:
+                count = await proxy_client.get_count(country=country, version=version)
+            except (Proxy6Error, asyncio.TimeoutError) as e:
+                logger.warning(f'Stock refresh for {(version, country)} failed: {e!r}')
+                continue
+            self._counts[(version, country)] = int(count)
+            refreshed += 1
+
+        self.updated_at = time()
+        return refreshed
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        # После восстановления из снимка свежие остатки не запрашиваются повторно
+        if self.updated_at is not None:
+            await asyncio.sleep(max(0.0, self.interval - (time() - self.updated_at)))
+
+        while True:
+            try:
+                refreshed = await self.refresh()
+                logger.info(f'Stock refresh: {refreshed} counts updated')
+            except Exception:
+                logger.exception('Stock refresh failed')
+
+            await asyncio.sleep(self.interval)
+
+
+stock_index = StockIndex()
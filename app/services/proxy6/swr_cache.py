@@ -0,0 +1,185 @@
+import asyncio
+import logging
+from time import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    updated_at: float
+
+    def age(self) -> float:
+        return time() - self.updated_at
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class SWRCache(Generic[K, V]):
+    """
+    Асинхронный TTL-кэш с семантикой stale-while-revalidate.
+
+    - Свежее значение (моложе ``ttl``) отдаётся сразу.
+    - Устаревшее значение тоже отдаётся сразу, а в фоне запускается
+      его обновление; пока оно идёт, все читатели получают старое значение.
+    - Если обновление завершилось ошибкой или вернуло невалидный результат
+      (например, пустой список), остаётся последнее хорошее значение.
+    - Если значения нет совсем, вызывающий ждёт загрузку; одновременные
+      промахи по одному ключу разделяют одну загрузку.
+
+    Parameters
+    ----------
+    loader : Callable[[K], Awaitable[V]]
+        Корутина, загружающая значение по ключу.
+    ttl : float
+        Время в секундах, в течение которого значение считается свежим.
+    max_stale : float | None, optional
+        Сколько секунд после истечения ``ttl`` ещё можно отдавать устаревшее
+        значение. ``None`` — без ограничения.
+    is_valid : Callable[[V], bool], optional
+        Проверка результата загрузки; невалидные значения не кэшируются.
+        По умолчанию значение должно быть непустым.
+    name : str, optional
+        Имя кэша для логов.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[K], Awaitable[V]],
+        *,
+        ttl: float,
+        max_stale: float | None = None,
+        is_valid: Callable[[V], bool] = bool,
+        name: str = 'cache'
+    ) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.is_valid = is_valid
+        self.name = name
+
+        self.stats = CacheStats()
+
+        self._entries: dict[K, CacheEntry[V]] = {}
+        self._loading: dict[K, asyncio.Task] = {}
+
+    async def get(self, key: K) -> V:
+        """
+        Возвращает значение по ключу.
+
+        Parameters
+        ----------
+        key : K
+            Ключ кэша.
+
+        Returns
+        -------
+        V
+            Закэшированное или загруженное значение.
+
+        Raises
+        ------
+        Exception
+            Ошибка загрузчика, если значения в кэше нет совсем
+            (или оно старше ``ttl + max_stale``).
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = entry.age()
+            if age < self.ttl:
+                self.stats.hits += 1
+                return entry.value
+
+            if self.max_stale is None or age < self.ttl + self.max_stale:
+                self.stats.stale_hits += 1
+                self._load(key)
+                return entry.value
+
+        self.stats.misses += 1
+        return await asyncio.shield(self._load(key))
+
+    def peek(self, key: K) -> V | None:
+        """
+        Возвращает закэшированное значение без загрузки и обновления.
+        """
+        entry = self._entries.get(key)
+        return entry.value if entry else None
+
+    def set(self, key: K, value: V, updated_at: float | None = None) -> None:
+        """
+        Записывает значение в кэш.
+
+        Parameters
+        ----------
+        key : K
+            Ключ кэша.
+        value : V
+            Значение.
+        updated_at : float | None, optional
+            Время получения значения (unix time). По умолчанию — текущее.
+        """
+        self._entries[key] = CacheEntry(value, time() if updated_at is None else updated_at)
+
+    def invalidate(self, key: K | None = None) -> None:
+        """
+        Удаляет значение по ключу или, если ключ не указан, очищает кэш.
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def items(self) -> list[tuple[K, CacheEntry[V]]]:
+        return list(self._entries.items())
+
+    def _load(self, key: K) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key))
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._loaded(key, t))
+        return task
+
+    def _loaded(self, key: K, task: asyncio.Task) -> None:
+        self._loading.pop(key, None)
+        if not task.cancelled():
+            # фоновое обновление могли не дождаться — помечаем ошибку как полученную
+            task.exception()
+
+    async def _refresh(self, key: K) -> Any:
+        self.stats.refreshes += 1
+        previous = self._entries.get(key)
+
+        try:
+            value = await self.loader(key)
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            if previous is None:
+                raise
+            logger.warning(f'{self.name}: refresh of {key!r} failed, serving stale value: {e!r}')
+            return previous.value
+
+        if not self.is_valid(value):
+            self.stats.refresh_errors += 1
+            if previous is not None:
+                logger.warning(f'{self.name}: refresh of {key!r} returned {value!r}, serving stale value')
+                return previous.value
+            return value
+
+        self.set(key, value)
+        return value
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from collections import defaultdict
 from dataclasses import dataclass
@@ -11,12 +12,19 @@ from app.database.models import User, Proxy, Basket
 
 from app.services.proxy6.engine import proxy_client
 from app.services.proxy6.client import Proxy6Error
-from app.services.proxy6.cache import get_price_cache, save_price_cache
+from app.services.proxy6.cache import (PRICE_TTL, PriceKey, get_cached_prices, 
+                                       get_last_known_prices, save_price_caches, 
+                                       price_l1, price_failures,
+                                       cache_backend, price_backend_key)
+from app.services.proxy6.price_matrix import price_matrix
 
 from app.utils.constants import (COUNTRY_NAMES, COUNTRY_FLAGS, 
                                  PROXY_VERSION_MAP, PROXY_TYPE_MAP)
 
 
+LOW_STOCK = 10  # остаток, начиная с которого он показывается на кнопке страны
+
+
 def get_profile_text(user: User) -> str:
     """
     Формирует текст профиля пользователя для отображения в Telegram-боте.
@@ -124,13 +132,19 @@ def get_proxy_list_text(proxies: list[Proxy]) -> str:
     return header + '\n\n'.join(blocks)
 
 
-def get_markup_contries(countries: list[str]) -> InlineKeyboardMarkup:
+def get_markup_contries(
+    countries: list[str],
+    stock: dict[str, int] | None = None
+) -> InlineKeyboardMarkup:
     """
     Формирует inline-клавиатуру со списком стран для выбора прокси.
 
     Для каждой страны создаётся кнопка с флагом и названием страны.
     Callback-данные имеют формат: ``country:<code>``.
 
+    Если известны остатки прокси, страны без прокси не показываются,
+    а к странам с малым остатком добавляется число доступных прокси.
+
     В конце клавиатуры добавляется кнопка возврата «Назад».
 
     Parameters
@@ -138,6 +152,9 @@ def get_markup_contries(countries: list[str]) -> InlineKeyboardMarkup:
     countries : list[str]
         Список кодов стран в формате ISO 3166-1 alpha-2
         (например: ``["ru", "us", "de"]``).
+    stock : dict[str, int] | None, optional
+        Остатки прокси по кодам стран; страны без записи считаются
+        доступными.
 
     Returns
     -------
@@ -151,13 +168,19 @@ def get_markup_contries(countries: list[str]) -> InlineKeyboardMarkup:
     • Названия стран формируются через функцию ``get_country_name``  
     • Кнопки автоматически группируются по 3 в ряд
     """
+    stock = stock or {}
     builder = InlineKeyboardBuilder()
 
     for code in countries:
-        builder.button(
-            text=f"{COUNTRY_FLAGS.get(code, '🏴')} {COUNTRY_NAMES.get(code, code.upper())}",
-            callback_data=f"country:{code}"
-        )
+        count = stock.get(code)
+        if count == 0:
+            continue
+
+        text = f"{COUNTRY_FLAGS.get(code, '🏴')} {COUNTRY_NAMES.get(code, code.upper())}"
+        if count is not None and count <= LOW_STOCK:
+            text += f" ({count})"
+
+        builder.button(text=text, callback_data=f"country:{code}")
 
     builder.adjust(3)
 
@@ -171,6 +194,43 @@ def get_markup_contries(countries: list[str]) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@dataclass(frozen=True)
+class PriceQuote:
+    """
+    Цена комбинации прокси в копейках.
+
+    ``stale`` — это последняя известная (устаревшая) цена, показанная
+    из-за недоступности API. ``estimated`` — цена нескольких прокси,
+    рассчитанная по матрице цен и ещё не подтверждённая API.
+    ``amount == 0`` — цены нет совсем. Счёт можно выставлять только
+    по ``payable`` цене.
+    """
+    amount: int
+    stale: bool = False
+    estimated: bool = False
+
+    @property
+    def payable(self) -> bool:
+        return self.amount > 0 and not self.stale and not self.estimated
+
+
+def format_price(quote: PriceQuote) -> str:
+    """
+    Форматирует цену для сообщения с пометкой об устаревшей или недоступной цене.
+    """
+    if not quote.amount:
+        return '<b>недоступна</b>'
+    if quote.stale:
+        return f'<b>~{quote.amount / 100:.2f} ₽</b> (может быть неактуальна)'
+    return f'<b>{quote.amount / 100:.2f} ₽</b>'
+
+
+PRICE_UNAVAILABLE_TEXT = (
+    '⚠️ Сейчас не удаётся получить актуальную цену у Proxy6, '
+    'поэтому оплата временно недоступна. Попробуйте через минуту.'
+)
+
+
 @dataclass
 class BasketGroup:
     proxy_version: int
@@ -245,15 +305,22 @@ async def calc_price_proxy6(
     proxy_version: int,
     count: int,
     period: int,
-    session
-) -> int:
+    session,
+    exact: bool = False
+) -> PriceQuote:
     """
     Расчёт стоимости прокси через API Proxy6 с использованием кэша.
 
-    Функция сначала пытается получить цену из базы данных (кэш),
-    актуальный в течение 24 часов. Если кэш отсутствует или устарел,
-    выполняется запрос к API Proxy6, после чего цена сохраняется
-    в кэш для повторного использования.
+    Функция сначала пытается получить цену из кэша (память процесса,
+    затем база данных), актуального в течение 24 часов. Если кэш отсутствует или устарел,
+    цена рассчитывается по матрице цен (цена одного прокси × количество),
+    которой нужен один запрос к API на версию и период в сутки. Если матрица
+    для версии отключена после расхождения с API, выполняется точный запрос
+    к API Proxy6, после чего цена сохраняется в кэш для повторного использования.
+
+    Если API вернул ошибку, комбинация на ``PRICE_FAILURE_TTL`` секунд
+    попадает в негативный кэш и не запрашивается повторно, а вместо цены
+    возвращается последняя известная цена с пометкой ``stale``.
 
     Parameters
     ----------
@@ -269,51 +336,145 @@ async def calc_price_proxy6(
     session : AsyncSession
         Асинхронная сессия SQLAlchemy для работы с базой данных.
 
+    exact : bool, optional
+        Не использовать оценку по матрице цен (см. ``calc_prices_proxy6``).
+
     Returns
     -------
-    int
-        Стоимость в копейках.
-        Возвращает ``0``, если произошла ошибка при запросе к API Proxy6.
+    PriceQuote
+        Стоимость в копейках. Если API недоступен — последняя известная
+        цена с ``stale=True`` или, если её нет, ``amount == 0``.
     """
-    cache = await get_price_cache(
-        proxy_version=proxy_version,
-        count=count,
-        period=period,
-        session=session
-    )
+    key = (proxy_version, count, period)
+    prices = await calc_prices_proxy6([key], session, exact=exact)
+    return prices[key]
+
 
-    if cache and not cache.is_expired():
-        return int(cache.price_rub * 100)
+async def calc_prices_proxy6(
+    keys: list[PriceKey],
+    session: AsyncSession,
+    *,
+    exact: bool = False
+) -> dict[PriceKey, PriceQuote]:
+    """
+    Пакетный расчёт стоимости нескольких комбинаций прокси.
+
+    Все кэшированные цены загружаются одним запросом к базе данных,
+    недостающие запрашиваются параллельно (частоту запросов к API
+    ограничивает клиент Proxy6), а полученные от API цены сохраняются
+    в кэш одной транзакцией. Для комбинаций, цену которых получить
+    не удалось, подставляется последняя известная цена с пометкой ``stale``.
+
+    Цена нескольких прокси по матрице цен — только оценка
+    (``estimated=True``): по ней нельзя выставить счёт и она не кэшируется.
+    Перед оплатой цены запрашиваются с ``exact=True`` — тогда такие
+    комбинации запрашиваются у API точно.
+
+    Parameters
+    ----------
+    keys : list[PriceKey]
+        Комбинации ``(proxy_version, count, period)``.
+
+    session : AsyncSession
+        Асинхронная сессия SQLAlchemy для работы с базой данных.
+
+    exact : bool, optional
+        Не использовать оценку по матрице цен для нескольких прокси.
+
+    Returns
+    -------
+    dict[PriceKey, PriceQuote]
+        Стоимость в копейках для каждой комбинации.
+    """
+    cached = await get_cached_prices(keys, session)
+    misses = [key for key in dict.fromkeys(keys) if key not in cached]
+
+    fetched = await asyncio.gather(*(_fetch_price(key, exact=exact) for key in misses))
+
+    # В кэш базы данных пишутся только точные цены API. Цена одного прокси
+    # по матрице совпадает с ответом API и попадает в L1, оценки не кэшируются
+    live_prices: dict[PriceKey, float] = {}
+    failed: list[PriceKey] = []
+    quotes = {key: PriceQuote(round(price_rub * 100)) for key, price_rub in cached.items()}
+
+    for key, (price_rub, is_live) in zip(misses, fetched):
+        if price_rub is None:
+            failed.append(key)
+            continue
+
+        if is_live:
+            quotes[key] = PriceQuote(round(price_rub * 100))
+            live_prices[key] = price_rub
+        elif key[1] > 1:
+            quotes[key] = PriceQuote(round(price_rub * 100), estimated=True)
+        else:
+            quotes[key] = PriceQuote(round(price_rub * 100))
+            # Сверка в фоне могла отключить матрицу, пока считались остальные цены
+            if key[0] not in price_matrix.disabled_versions:
+                price_l1.set(key, price_rub)
+
+    await save_price_caches(live_prices, session)
+
+    if failed:
+        last_known = await get_last_known_prices(failed, session)
+        for key in failed:
+            price_rub = last_known.get(key)
+            quotes[key] = PriceQuote(round(price_rub * 100), stale=True) if price_rub else PriceQuote(0)
+
+    return quotes
+
+
+async def _fetch_price(key: PriceKey, *, exact: bool = False) -> tuple[float | None, bool]:
+    """
+    Получает цену комбинации по матрице цен или, если матрица для версии
+    отключена (или при ``exact`` для нескольких прокси), точным запросом к API.
+
+    Returns
+    -------
+    tuple[float | None, bool]
+        Цена в рублях (``None`` при ошибке или таймауте API или если
+        комбинация в негативном кэше) и признак того, что цена получена точным
+        запросом к API.
+    """
+    proxy_version, count, period = key
+
+    if price_failures.get(key) is not None:
+        return None, False
 
     try:
-        price_rub = await proxy_client.get_price(
-            count=count,
-            period=period,
-            version=proxy_version
+        if not exact or count == 1:
+            matrix_price = await price_matrix.quote(
+                proxy_version=proxy_version,
+                count=count,
+                period=period
+            )
+            if matrix_price is not None:
+                return matrix_price, False
+
+        # Одну и ту же цену у API запрашивает только один воркер
+        price_rub = await cache_backend.get_or_load(
+            price_backend_key(key),
+            lambda: proxy_client.get_price(count=count, period=period, version=proxy_version),
+            ttl=PRICE_TTL.total_seconds()
         )
-    except Proxy6Error:
-        return 0
-
-    await save_price_cache(
-        proxy_version=proxy_version,
-        count=count,
-        period=period,
-        price_rub=float(price_rub),
-        session=session
-    )
+    except (Proxy6Error, asyncio.TimeoutError) as e:
+        price_failures.set(key, str(e) or type(e).__name__)
+        return None, False
 
-    return int(float(price_rub) * 100)
+    return float(price_rub), True
 
 
 async def format_basket_proxies(
     baskets: list[Basket],
-    session: AsyncSession
-) -> tuple[str, int]:
+    session: AsyncSession,
+    *,
+    exact: bool = False
+) -> tuple[str, int, bool]:
     """
     Формирует текстовое представление корзины с прокси и рассчитывает итоговую стоимость.
 
     Прокси в корзине группируются по параметрам (версия, тип, страна, период),
-    для каждой группы рассчитывается цена через API Proxy6 с использованием кэша.
+    цены всех групп рассчитываются одним пакетом через ``calc_prices_proxy6``.
     В конце формируется итоговая сумма по всем позициям.
 
     Parameters
@@ -324,36 +485,46 @@ async def format_basket_proxies(
     session : AsyncSession
         Асинхронная сессия SQLAlchemy для получения и кэширования цен.
 
+    exact : bool, optional
+        Запросить точные цены вместо оценки по матрице цен (перед оплатой).
+
     Returns
     -------
-    tuple[str, int]
-        Кортеж из двух элементов:
+    tuple[str, int, bool]
+        Кортеж из трёх элементов:
 
         - ``str`` — HTML-текст для отправки пользователю в Telegram.
         - ``int`` — общая стоимость корзины в копейках.
+        - ``bool`` — можно ли выставить счёт: у всех позиций есть
+          актуальная точная цена (без ``exact`` оценки по матрице
+          цен считаются неподтверждёнными).
 
-        Если корзина пуста, возвращается сообщение о пустой корзине
-        и сумма ``0``.
+        Если корзина пуста, возвращается сообщение о пустой корзине,
+        сумма ``0`` и ``False``.
     """
 
     if not baskets:
-        return '🛒 <b>Ваша корзина пуста.</b>', 0
+        return '🛒 <b>Ваша корзина пуста.</b>', 0, False
 
     groups = group_basket_items(baskets)
 
+    quotes = await calc_prices_proxy6(
+        [(item.proxy_version, item.count, item.period) for item in groups],
+        session,
+        exact=exact
+    )
+
     lines = ['🛒 <b>Ваша корзина:</b>\n']
     total_price = 0
+    payable = True
+    unavailable = False
 
     for i, item in enumerate(groups, start=1):
-        price = await calc_price_proxy6(
-                proxy_version=item.proxy_version,
-                count=item.count,
-                period=item.period,
-                session=session
-            )
-
+        quote = quotes[(item.proxy_version, item.count, item.period)]
 
-        total_price += price
+        total_price += quote.amount
+        payable = payable and quote.payable
+        unavailable = unavailable or not quote.amount or quote.stale
 
         lines.append(
             f"<b>{i}️⃣ {PROXY_VERSION_MAP.get(item.proxy_version)} | "
@@ -361,11 +532,14 @@ async def format_basket_proxies(
             f"{COUNTRY_NAMES.get(item.country)}</b>\n"
             f"   🔢 Кол-во: <b>{item.count}</b>\n"
             f"   ⏳ Период: <b>{item.period} дней</b>\n"
-            f"   💰 Цена: <b>{price / 100:.2f} ₽</b>\n"
+            f"   💰 Цена: {format_price(quote)}\n"
         )
 
     lines.append(
         f"\n<b>Итого:</b> 💳 <b>{total_price / 100:.2f} ₽</b>"
     )
 
-    return "\n".join(lines), total_price
\ No newline at end of file
+    if unavailable:
+        lines.append(f"\n{PRICE_UNAVAILABLE_TEXT}")
+
+    return "\n".join(lines), total_price, payable
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from time import monotonic
+from dataclasses import dataclass
+from typing import Generic, Hashable, TypeVar
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+@dataclass
+class LRUStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Ограниченный по размеру in-memory кэш с вытеснением давно
+    неиспользуемых записей (LRU) и временем жизни записей (TTL).
+
+    Parameters
+    ----------
+    maxsize : int
+        Максимальное количество записей.
+    ttl : float
+        Время жизни записи по умолчанию в секундах.
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = LRUStats()
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """
+        Возвращает значение по ключу или ``None``, если его нет или оно устарело.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+
+        value, expires_at = item
+        if monotonic() >= expires_at:
+            del self._data[key]
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Записывает значение.
+
+        Parameters
+        ----------
+        key : K
+            Ключ.
+        value : V
+            Значение.
+        ttl : float | None, optional
+            Время жизни записи в секундах; не больше ``self.ttl``.
+            По умолчанию ``self.ttl``.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (value, monotonic() + ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K | None = None) -> None:
+        """
+        Удаляет запись по ключу или, если ключ не указан, очищает кэш.
+        """
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def items(self) -> list[tuple[K, V, float]]:
+        """
+        Возвращает неустаревшие записи с оставшимся временем жизни в секундах.
+        """
+        now = monotonic()
+        return [
+            (key, value, expires_at - now)
+            for key, (value, expires_at) in self._data.items()
+            if expires_at > now
+        ]
+
+    def __len__(self) -> int:
+        return len(self._data)
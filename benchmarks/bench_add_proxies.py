@@ -0,0 +1,124 @@
+"""
+Бенчмарк записи купленных прокси в базу данных.
+
+Сравнивает прежний способ (ORM-объект ``Proxy`` на каждую запись
+и unit of work) с пакетным ``insert(Proxy)`` из ``add_proxies``
+на заказах из 1, 100 и 5000 прокси. Используется SQLite в файле
+во временном каталоге, каждая запись — отдельная транзакция.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_add_proxies
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.models import Base, Proxy, User
+from app.database.queries.orm_proxy import add_proxies
+
+from benchmarks.bench_json_decode import make_getproxy_payload
+
+
+ORDER_SIZES = (1, 100, 5000)
+
+
+async def add_proxies_orm(user_id: int, data: dict, session: AsyncSession) -> None:
+    """
+    Прежняя реализация ``add_proxies``: ORM-объект на каждый прокси.
+    """
+    country = data['country']
+
+    for proxy_data in data['list'].values():
+        session.add(Proxy(
+            user_id=user_id,
+            ip=proxy_data['host'],
+            port=proxy_data['port'],
+            login=proxy_data['user'],
+            password=proxy_data['pass'],
+            proxy_type=proxy_data['type'],
+            proxy_version=proxy_data['version'],
+            country=country,
+            date_start=datetime.fromtimestamp(proxy_data['unixtime']),
+            date_end=datetime.fromtimestamp(proxy_data['unixtime_end']),
+            ids=int(proxy_data['id']),
+        ))
+
+    await session.commit()
+
+
+def make_buy_payload(count: int) -> dict:
+    """
+    Формирует ответ ``buy`` на ``count`` прокси.
+    """
+    data = json.loads(make_getproxy_payload(count))
+    data['country'] = 'ru'
+    return data
+
+
+async def measure(session_pool, func, repeat: int) -> tuple[float, float]:
+    """
+    Возвращает лучшее время одного вызова в секундах и пик выделенной памяти в МиБ.
+    """
+    best = float('inf')
+    peak = 0
+
+    for _ in range(repeat):
+        async with session_pool() as session:
+            await session.execute(delete(Proxy))
+            await session.commit()
+
+        async with session_pool() as session:
+            tracemalloc.start()
+            start = perf_counter()
+            await func(session)
+            best = min(best, perf_counter() - start)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    return best, peak / 1024 / 1024
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f'sqlite+aiosqlite:///{os.path.join(tmp, "bench.db")}')
+        session_pool = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with session_pool() as session:
+            session.add(User(tg_id=1, first_name='bench'))
+            await session.commit()
+            user_id = await session.scalar(select(User.id))
+
+        print(f'{"proxies":>8} {"ORM, ms":>10} {"bulk, ms":>10} {"speedup":>8} {"ORM, MiB":>10} {"bulk, MiB":>10}')
+
+        for count in ORDER_SIZES:
+            data = make_buy_payload(count)
+            repeat = 20 if count < 1000 else 3
+
+            orm_time, orm_mem = await measure(
+                session_pool, lambda s: add_proxies_orm(user_id, data, s), repeat
+            )
+            bulk_time, bulk_mem = await measure(
+                session_pool, lambda s: add_proxies(1, data, s), repeat
+            )
+
+            print(
+                f'{count:>8} {orm_time * 1000:>10.2f} {bulk_time * 1000:>10.2f} '
+                f'{orm_time / bulk_time:>7.1f}x {orm_mem:>10.2f} {bulk_mem:>10.2f}'
+            )
+
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
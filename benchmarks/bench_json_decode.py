@@ -0,0 +1,77 @@
+"""
+Микробенчмарк декодирования ответа getproxy на 1000 прокси.
+
+Сравнивает стандартный ``json.loads`` и ``orjson.loads`` (если установлен)
+на ответе той же структуры, что и примеры в helper.md.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_json_decode
+"""
+
+import json
+import random
+import timeit
+
+from app.services.proxy6.json_decoder import orjson
+
+
+def make_getproxy_payload(count: int = 1000, seed: int = 0) -> bytes:
+    """
+    Формирует ответ getproxy с ``count`` прокси в формате API Proxy6.
+    """
+    rnd = random.Random(seed)
+    start = 1767514245
+
+    proxies = {}
+    for i in range(count):
+        proxy_id = str(36253668 + i)
+        unixtime = start + i * 60
+        proxies[proxy_id] = {
+            'id': proxy_id,
+            'ip': ':'.join(f'{rnd.getrandbits(16):04x}' for _ in range(8)),
+            'host': f'45.145.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}',
+            'port': str(rnd.randint(10000, 65000)),
+            'user': ''.join(rnd.choices('abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789', k=6)),
+            'pass': ''.join(rnd.choices('abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789', k=6)),
+            'type': rnd.choice(['http', 'socks']),
+            'version': rnd.choice(['3', '4', '6']),
+            'date': '2026-01-04 11:10:45',
+            'date_end': '2026-01-07 11:10:45',
+            'unixtime': unixtime,
+            'unixtime_end': unixtime + 3 * 86400,
+            'descr': '',
+            'active': '1',
+        }
+
+    payload = {
+        'status': 'yes',
+        'user_id': '639793',
+        'balance': '49.62',
+        'currency': 'RUB',
+        'date_mod': '2026-01-04 11:12:45',
+        'list_count': count,
+        'list': proxies,
+    }
+    return json.dumps(payload).encode()
+
+
+def main(number: int = 200) -> None:
+    body = make_getproxy_payload()
+    print(f'payload: {len(body) / 1024:.1f} KiB, 1000 proxies, {number} runs')
+
+    decoders = {'json.loads': json.loads}
+    if orjson is not None:
+        decoders['orjson.loads'] = orjson.loads
+    else:
+        print('orjson is not installed, only stdlib is measured')
+
+    baseline = None
+    for name, loads in decoders.items():
+        assert loads(body) == json.loads(body)
+        seconds = min(timeit.repeat(lambda: loads(body), number=number, repeat=5)) / number
+        baseline = baseline or seconds
+        print(f'{name:<14} {seconds * 1000:8.3f} ms/decode  x{baseline / seconds:.1f}')
+
+
+if __name__ == '__main__':
+    main()
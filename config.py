@@ -9,4 +9,43 @@ BOT_TOKEN = os.getenv('BOT_TOKEN')
 YOOKASSA_API_KEY = os.getenv('YOOKASSA_API_KEY')
 YOOKASSA_SHOP_ID = os.getenv('YOOKASSA_SHOP_ID')
 
-DATABASE_URL = os.getenv('DATABASE_URL')
\ No newline at end of file
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+# Сколько позиций корзины покупается у Proxy6 одновременно
+CHECKOUT_CONCURRENCY = int(os.getenv('CHECKOUT_CONCURRENCY', 3))
+
+# Базовый URL API Proxy6; для локальных прогонов — адрес MockProxy6Server
+PROXY6_BASE_URL = os.getenv('PROXY6_BASE_URL') or None
+
+# Фоновый прогрев кэша цен: период запуска и число самых популярных комбинаций
+PRICE_WARMER_INTERVAL = int(os.getenv('PRICE_WARMER_INTERVAL', 30 * 60))
+PRICE_WARMER_TOP = int(os.getenv('PRICE_WARMER_TOP', 50))
+
+# Доля цен из матрицы цен, которые дополнительно сверяются с живым API (0 — не сверять)
+PRICE_MATRIX_VERIFY_RATE = float(os.getenv('PRICE_MATRIX_VERIFY_RATE', 0.05))
+
+# Через сколько секунд матрица цен, отключённая после расхождения с API, включается снова
+PRICE_MATRIX_DISABLE_TIMEOUT = int(os.getenv('PRICE_MATRIX_DISABLE_TIMEOUT', 60 * 60))
+
+# Период фонового обновления остатков прокси по странам (getcount), сек
+STOCK_REFRESH_INTERVAL = int(os.getenv('STOCK_REFRESH_INTERVAL', 10 * 60))
+
+# Снимок кэшей в памяти для быстрого старта после перезапуска
+CACHE_SNAPSHOT_PATH = os.getenv('CACHE_SNAPSHOT_PATH', 'cache_snapshot.json')
+CACHE_SNAPSHOT_INTERVAL = int(os.getenv('CACHE_SNAPSHOT_INTERVAL', 5 * 60))
+
+# Общий кэш ответов Proxy6 для нескольких воркеров: memory://, sqlite:///cache.db, redis://host:6379/0
+CACHE_BACKEND_URL = os.getenv('CACHE_BACKEND_URL') or None
+
+# Настройки SQLite: ожидание блокировки (мс), режим синхронизации, mmap (байты), кэш страниц (< 0 — КиБ)
+DB_SQLITE_BUSY_TIMEOUT = int(os.getenv('DB_SQLITE_BUSY_TIMEOUT', 5000))
+DB_SQLITE_SYNCHRONOUS = os.getenv('DB_SQLITE_SYNCHRONOUS', 'NORMAL')
+DB_SQLITE_MMAP_SIZE = int(os.getenv('DB_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+DB_SQLITE_CACHE_SIZE = int(os.getenv('DB_SQLITE_CACHE_SIZE', -64 * 1024))
+
+# Пул соединений для серверных СУБД (PostgreSQL, MySQL)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 30 * 60))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
@@ -5,9 +5,13 @@ from aiogram import Bot, Dispatcher
 
 from app.middlewares.db import DataBaseSession
 
-from app.database.engine import start_up_db, create_db, async_session
+from app.database.engine import start_up_db, create_db, async_session, log_engine_settings
 
 from app.services.proxy6.engine import on_startup, on_shutdown
+from app.services.proxy6.price_warmer import PriceWarmer
+from app.services.proxy6.stock import stock_index
+from app.services.proxy6.snapshot import cache_snapshotter
+from app.services.proxy6.cache import shared_cache_sync
 
 from app.handlers.user.base import user_base_router
 from app.handlers.user.proxy import user_proxy_router
@@ -23,7 +27,17 @@ dp.include_router(user_base_router)
 dp.include_router(user_proxy_router)
 dp.include_router(user_basket_router)
 
+price_warmer = PriceWarmer(async_session)
+
 dp.startup.register(on_startup)
+dp.startup.register(cache_snapshotter.start)
+dp.startup.register(shared_cache_sync.start)
+dp.startup.register(price_warmer.start)
+dp.startup.register(stock_index.start)
+dp.shutdown.register(stock_index.stop)
+dp.shutdown.register(cache_snapshotter.stop)
+dp.shutdown.register(price_warmer.stop)
+dp.shutdown.register(shared_cache_sync.stop)
 dp.shutdown.register(on_shutdown)
 
 
@@ -31,7 +45,11 @@ async def main():
     # await create_db()
     # await start_up_db()
     # await bot.delete_my_commands(scope=types.BotCommandScopeAllPrivateChats())
-    dp.update.middleware(DataBaseSession(session_pool=async_session))
+    log_engine_settings()
+    # Внутренняя middleware: сессия открывается только для обработчиков, которым она нужна
+    db_session = DataBaseSession(session_pool=async_session)
+    dp.message.middleware(db_session)
+    dp.callback_query.middleware(db_session)
     await bot.delete_webhook(drop_pending_updates=True)
     await dp.start_polling(bot)
 
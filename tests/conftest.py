@@ -0,0 +1,51 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+# Настройки до импорта config: тесты не должны зависеть от .env
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite://')
+os.environ.setdefault('PRICE_MATRIX_VERIFY_RATE', '0')
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database.models import Base
+from app.services.proxy6.cache import cache_backend, country_cache, price_failures, price_l1
+from app.services.proxy6.price_matrix import price_matrix
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    """
+    Сбрасывает кэши в памяти процесса между тестами.
+    """
+    yield
+    price_l1.invalidate()
+    price_failures.invalidate()
+    country_cache.invalidate()
+    price_matrix.clear()
+    price_matrix.disabled_versions.clear()
+    asyncio.run(cache_backend.invalidate('*'))
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    """
+    Фабрика сессий к пустой базе SQLite во временном каталоге.
+
+    Движок создаётся внутри цикла событий теста: ``async with db_session() as session``.
+    """
+    url = f'sqlite+aiosqlite:///{tmp_path / "test.db"}'
+
+    @asynccontextmanager
+    async def session_factory():
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                yield session
+        finally:
+            await engine.dispose()
+
+    return session_factory
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.services.proxy6.cache_backend import InMemoryBackend
+
+
+def test_in_memory_backend_is_bounded():
+    async def main():
+        backend = InMemoryBackend(maxsize=3)
+        for i in range(10):
+            await backend.set(f'price:4:{i}:30', i, ttl=60)
+        return [await backend.get(f'price:4:{i}:30') for i in range(10)]
+
+    assert asyncio.run(main()) == [None] * 7 + [7, 8, 9]
+
+
+def test_in_memory_backend_expires_and_invalidates_by_prefix():
+    async def main():
+        backend = InMemoryBackend()
+        await backend.set('countries:4', ['ru'], ttl=0.01)
+        await backend.set('price:4:1:30', 1.5, ttl=60)
+        await backend.set('price:6:1:30', 0.5, ttl=60)
+        await asyncio.sleep(0.02)
+        await backend.invalidate('price:4:*')
+        return [await backend.get(key) for key in ('countries:4', 'price:4:1:30', 'price:6:1:30')]
+
+    assert asyncio.run(main()) == [None, None, 0.5]
+
+
+def test_get_or_load_loads_once_for_concurrent_callers():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ['ru', 'de']
+
+    async def main():
+        backend = InMemoryBackend()
+        return await asyncio.gather(*(backend.get_or_load('countries:4', loader, ttl=60) for _ in range(5)))
+
+    assert asyncio.run(main()) == [['ru', 'de']] * 5
+    assert len(calls) == 1
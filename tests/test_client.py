@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.services.proxy6.client import (AsyncProxy6, Proxy6, Proxy6BulkError, Proxy6Error,
+                                        Proxy6TransientError, parse_proxy_status)
+from app.services.proxy6.limiter import AdaptiveRateLimiter
+from app.services.proxy6.mock_server import MockProxy6Server
+from app.services.proxy6.retry import CircuitBreaker, RetryPolicy
+
+
+def make_client(base_url: str, **kwargs) -> AsyncProxy6:
+    return AsyncProxy6(
+        'test-key',
+        base_url=base_url,
+        rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000),
+        circuit_breaker=CircuitBreaker(),
+        **kwargs
+    )
+
+
+def test_timeout_after_retries_is_transient_error():
+    async def main():
+        async with MockProxy6Server(latency=0.5) as server:
+            policy = RetryPolicy(max_attempts=2, base_delay=0, attempt_timeout=0.05)
+            async with make_client(server.base_url, retry_policy=policy) as client:
+                with pytest.raises(Proxy6TransientError) as exc_info:
+                    await client.get_price(count=1, period=30, version=4)
+            return exc_info.value, server.calls['getprice']
+
+    error, calls = asyncio.run(main())
+
+    assert isinstance(error, Proxy6Error)
+    assert isinstance(error.__cause__, asyncio.TimeoutError)
+    assert calls == 2
+
+
+def test_sync_and_async_check_agree_against_mock():
+    async def main():
+        async with MockProxy6Server() as server:
+            async with make_client(server.base_url) as client:
+                bought = await client.buy(count=1, period=3, country='ru', version=4)
+                proxy_id = int(next(iter(bought['list'])))
+                async_result = await client.check(ids=proxy_id)
+                bulk_result = await client.check_bulk(ids=[proxy_id])
+
+            sync_client = Proxy6('test-key', base_url=server.base_url)
+            sync_result = await asyncio.to_thread(sync_client.check, ids=proxy_id)
+            return proxy_id, async_result, bulk_result, sync_result
+
+    proxy_id, async_result, bulk_result, sync_result = asyncio.run(main())
+
+    assert async_result is True
+    assert sync_result is True
+    assert bulk_result == {proxy_id: True}
+
+
+@pytest.mark.parametrize('value, expected', [(True, True), ('true', True), (False, False), ('false', False)])
+def test_parse_proxy_status(value, expected):
+    assert parse_proxy_status(value) is expected
+
+
+def test_close_waits_for_cancelled_keepalive():
+    async def main():
+        async with MockProxy6Server(latency=0.5) as server:
+            client = make_client(server.base_url)
+            await client.__aenter__()
+            client.start_keepalive(interval=0)
+            task = client._keepalive_task
+            # Даём пингу начаться, чтобы закрытие пришлось на открытый запрос
+            await asyncio.sleep(0.05)
+
+            session_close = client.session.close
+            task_done_on_session_close = []
+
+            async def close_session():
+                task_done_on_session_close.append(task.done())
+                await session_close()
+
+            client.session.close = close_session
+            await client.close()
+            return task_done_on_session_close, task.cancelled()
+
+    task_done_on_session_close, cancelled = asyncio.run(main())
+
+    assert task_done_on_session_close == [True]
+    assert cancelled
+
+
+def test_bulk_reports_cancelled_chunk_as_failed(monkeypatch):
+    client = make_client('http://127.0.0.1:1')
+
+    async def check(*, ids):
+        if ids == 2:
+            raise asyncio.CancelledError
+        return True
+
+    monkeypatch.setattr(client, 'check', check)
+
+    with pytest.raises(Proxy6BulkError) as exc_info:
+        asyncio.run(client.check_bulk(ids=[1, 2, 3]))
+
+    assert exc_info.value.failed_ids == (2,)
+    assert isinstance(exc_info.value.errors[0], asyncio.CancelledError)
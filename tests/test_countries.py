@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from app.services.proxy6.cache import get_countries
+from app.services.proxy6.client import Proxy6TransientError
+from app.services.proxy6.engine import proxy_client
+
+
+@pytest.mark.parametrize('error', [asyncio.TimeoutError(), Proxy6TransientError('Timeout while calling getcountry')])
+def test_get_countries_with_cold_cache_survives_timeout(monkeypatch, error):
+    async def get_country(**kwargs):
+        raise error
+
+    monkeypatch.setattr(proxy_client, 'get_country', get_country)
+
+    assert asyncio.run(get_countries(4)) == []
+
+
+def test_get_countries_returns_loaded_list(monkeypatch):
+    async def get_country(**kwargs):
+        return ['ru', 'de']
+
+    monkeypatch.setattr(proxy_client, 'get_country', get_country)
+
+    assert asyncio.run(get_countries(4)) == ['ru', 'de']
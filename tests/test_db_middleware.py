@@ -0,0 +1,53 @@
+import asyncio
+
+from aiogram.dispatcher.event.handler import HandlerObject
+
+from app.middlewares.db import DataBaseSession
+
+
+class FakeSessionPool:
+    def __init__(self):
+        self.opened = 0
+
+    def __call__(self):
+        pool = self
+
+        class Session:
+            async def __aenter__(self):
+                pool.opened += 1
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return Session()
+
+
+async def with_session(event, session):
+    return 'with session'
+
+
+async def without_session(event):
+    return 'without session'
+
+
+async def with_kwargs(event, **kwargs):
+    return 'with kwargs'
+
+
+def run(callback):
+    pool = FakeSessionPool()
+    middleware = DataBaseSession(session_pool=pool)
+    data = {'handler': HandlerObject(callback=callback)}
+
+    async def handler(event, data):
+        return 'session' in data
+
+    got_session = asyncio.run(middleware(handler, object(), data))
+    return got_session, pool.opened
+
+
+def test_session_opened_only_for_handlers_that_use_it():
+    assert run(with_session) == (True, 1)
+    assert run(with_kwargs) == (True, 1)
+    assert run(without_session) == (False, 0)
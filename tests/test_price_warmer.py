@@ -0,0 +1,31 @@
+import asyncio
+
+from app.services.proxy6 import price_warmer
+from app.services.proxy6.cache import get_cached_prices, price_l1
+from app.services.proxy6.engine import proxy_client
+
+
+def test_refresh_expiring_prices_skips_key_that_times_out(monkeypatch, db_session):
+    keys = [(4, 1, 30), (4, 5, 30), (6, 1, 7)]
+
+    async def get_popular_price_keys(session, limit):
+        return keys
+
+    async def get_price(*, count, period, version):
+        if (version, count, period) == (4, 1, 30):
+            raise asyncio.TimeoutError
+        return 1.5 * count
+
+    monkeypatch.setattr(price_warmer, 'get_popular_price_keys', get_popular_price_keys)
+    monkeypatch.setattr(proxy_client, 'get_price', get_price)
+
+    async def main():
+        async with db_session() as session:
+            refreshed = await price_warmer.refresh_expiring_prices(session)
+            price_l1.invalidate()
+            return refreshed, await get_cached_prices(keys, session)
+
+    refreshed, cached = asyncio.run(main())
+
+    assert refreshed == 2
+    assert cached == {(4, 5, 30): 7.5, (6, 1, 7): 1.5}
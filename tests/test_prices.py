@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.database.models import PriceCache
+from app.services.proxy6.cache import price_failures
+from app.services.proxy6.engine import proxy_client
+from app.utils.func_for_handlers import PriceQuote, calc_prices_proxy6
+
+
+def test_calc_prices_falls_back_to_last_known_price_on_timeout(monkeypatch, db_session):
+    calls = []
+
+    async def get_price(**kwargs):
+        calls.append(kwargs)
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(proxy_client, 'get_price', get_price)
+
+    async def main():
+        async with db_session() as session:
+            session.add(PriceCache(
+                proxy_version=4, count=2, period=3, price_rub=10.5,
+                updated_at=datetime.utcnow() - timedelta(days=2)
+            ))
+            await session.commit()
+
+            first = await calc_prices_proxy6([(4, 2, 3), (4, 5, 3)], session)
+            second = await calc_prices_proxy6([(4, 2, 3)], session)
+            return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first[(4, 2, 3)] == PriceQuote(1050, stale=True)
+    assert first[(4, 5, 3)] == PriceQuote(0)
+    assert not first[(4, 2, 3)].payable
+    assert second[(4, 2, 3)] == PriceQuote(1050, stale=True)
+
+    # Таймаут попадает в негативный кэш: повторный расчёт не обращается к API
+    assert price_failures.get((4, 2, 3)) is not None
+    assert price_failures.get((4, 5, 3)) is not None
+    assert len(calls) == 2
+
+
+def test_matrix_quote_for_several_proxies_is_not_payable_until_confirmed(monkeypatch, db_session):
+    calls = []
+
+    async def get_price(*, count, period, version):
+        calls.append(count)
+        # Скидка за объём: цена не линейна по количеству
+        return 2.0 if count == 1 else 1.9 * count
+
+    monkeypatch.setattr(proxy_client, 'get_price', get_price)
+
+    async def main():
+        async with db_session() as session:
+            shown = await calc_prices_proxy6([(4, 1, 30), (4, 5, 30)], session)
+            confirmed = await calc_prices_proxy6([(4, 1, 30), (4, 5, 30)], session, exact=True)
+            cached = await calc_prices_proxy6([(4, 5, 30)], session)
+            return shown, confirmed, cached
+
+    shown, confirmed, cached = asyncio.run(main())
+
+    assert shown[(4, 1, 30)] == PriceQuote(200)
+    assert shown[(4, 1, 30)].payable
+    assert shown[(4, 5, 30)] == PriceQuote(1000, estimated=True)
+    assert not shown[(4, 5, 30)].payable
+
+    assert confirmed[(4, 5, 30)] == PriceQuote(950)
+    assert confirmed[(4, 5, 30)].payable
+
+    # Подтверждённая цена кэшируется и дальше показывается вместо оценки
+    assert cached[(4, 5, 30)] == PriceQuote(950)
+    assert calls == [1, 5]
@@ -0,0 +1,25 @@
+import asyncio
+
+from app.services.proxy6 import stock
+from app.services.proxy6.engine import proxy_client
+from app.services.proxy6.stock import StockIndex
+
+
+def test_refresh_continues_after_country_timeout(monkeypatch):
+    async def get_countries(version):
+        return ['ru', 'de', 'us']
+
+    async def get_count(*, country, version):
+        if country == 'de':
+            raise asyncio.TimeoutError
+        return 10
+
+    monkeypatch.setattr(stock, 'get_countries', get_countries)
+    monkeypatch.setattr(proxy_client, 'get_count', get_count)
+
+    index = StockIndex(versions=(4,))
+    index.set(4, 'de', 3)
+
+    assert asyncio.run(index.refresh()) == 2
+    assert index.available(4, ['ru', 'de', 'us']) == {'ru': 10, 'de': 3, 'us': 10}
+    assert index.updated_at is not None